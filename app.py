@@ -1,6 +1,13 @@
-import streamlit as st
+import os
+import time
+
+import pandas as pd
 import plotly.graph_objects as go
-from utils.fuzzy_system import SistemaBienestarLaboral
+import streamlit as st
+from utils.configuracion import CONFIGURACION_BASE
+from utils.historial import COLUMNA_EMPLEADO, DIRECTORIO_HISTORIAL, HistorialBienestar, semana_iso
+from utils.recarga import SistemaRecargable
+from utils.tabla_respuesta import DIRECTORIO_CACHE
 
 def get_badge_html(tipo):
     """Genera HTML para badges según el tipo de recomendación"""
@@ -23,273 +30,317 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# CSS personalizado mejorado
-st.markdown("""
-<style>
-    /* Header principal */
-    .main-header {
-        font-size: 3rem;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 2rem;
-        font-weight: 700;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-    }
+# Estilos: se leen una sola vez por proceso y se inyectan en cada ejecución completa
+RUTA_ESTILOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'style.css')
+
+@st.cache_resource
+def cargar_estilos():
+    with open(RUTA_ESTILOS, encoding='utf-8') as archivo:
+        return f"<style>\n{archivo.read()}</style>"
+
+st.markdown(cargar_estilos(), unsafe_allow_html=True)
+
+# Inicializar sistema de lógica difusa
+@st.cache_resource
+def cargar_sistema():
+    # El motor compilado da los mismos resultados que skfuzzy y, con el
+    # artefacto guardado, arranca sin importar skfuzzy. Las reglas se leen de
+    # BIENESTAR_CONFIGURACION y se recargan si el archivo cambia.
+    return SistemaRecargable(
+        os.environ.get('BIENESTAR_CONFIGURACION', CONFIGURACION_BASE),
+        motor='compilado', tamano_cache=1024, directorio_artefacto=DIRECTORIO_CACHE
+    )
+
+sistema = cargar_sistema()
+sistema.comprobar()
+if sistema.ultimo_error is not None:
+    st.warning(f"No se pudo recargar la configuración; se mantiene la anterior: {sistema.ultimo_error}")
+
+@st.cache_resource
+def cargar_historial():
+    return HistorialBienestar(os.environ.get('BIENESTAR_HISTORIAL', DIRECTORIO_HISTORIAL))
+
+historial = cargar_historial()
+
+NOMBRES_ENTRADAS = {
+    'horas_trabajo': "Horas de trabajo semanales",
+    'calidad_sueno': "Calidad del sueño",
+    'carga_mental': "Carga mental",
+    'satisfaccion': "Satisfacción laboral",
+}
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def calcular_sensibilidad(firma, eje_x, eje_y, fijos):
+    """Malla de estrés y productividad; se guarda por configuración, ejes y entradas fijas"""
+    valores_x, valores_y, resultado = sistema.malla_sensibilidad(eje_x, eje_y, dict(fijos))
+    return valores_x, valores_y, resultado['nivel_estres'], resultado['productividad']
+
+# Espera tras mover un control en modo en vivo antes de diagnosticar; si llega
+# otro cambio en ese tiempo, Streamlit descarta esta ejecución y solo se
+# calcula la última posición de los controles
+ESPERA_EN_VIVO = 0.3
+
+@st.cache_resource(max_entries=256)
+def figura_perfil(firma, entradas):
+    """Gráfico radial del diagnóstico; se guarda por configuración y entradas"""
+    horas_trabajo, calidad_sueno, carga_mental, satisfaccion = entradas
+    resultado = sistema.diagnosticar(*entradas)
+    categorias = ['Estrés', 'Productividad', 'Sueño', 'Satisfacción', 'Carga Mental']
+    valores = [
+        resultado['nivel_estres'],
+        resultado['productividad'],
+        calidad_sueno * 10,  # Escalar a 100
+        satisfaccion * 10,   # Escalar a 100
+        carga_mental * 10    # Escalar a 100
+    ]
     
-    /* Tarjetas de métricas */
-    .metric-card {
-        background: white;
-        padding: 1.5rem;
-        border-radius: 15px;
-        border-left: 5px solid #1f77b4;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        margin-bottom: 1rem;
-        transition: transform 0.3s ease;
-    }
+    fig = go.Figure(data=go.Scatterpolar(
+        r=valores,
+        theta=categorias,
+        fill='toself',
+        line=dict(color='#1f77b4')
+    ))
     
-    .metric-card:hover {
-        transform: translateY(-5px);
-    }
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 100]
+            )),
+        showlegend=False,
+        height=400
+    )
+    return fig
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def tarjetas_recomendaciones(firma, entradas):
+    """HTML de todas las tarjetas de recomendación; se guarda por configuración y entradas"""
+    tarjetas = []
+    for rec in sistema.diagnosticar(*entradas)['recomendaciones']:
+        # Determinar clase CSS según criticidad
+        card_class = "recommendation-card"
+        if "CRÍTICO" in rec['tipo'] or "PRIORIDAD" in rec['tipo']:
+            card_class = "recommendation-card recommendation-critical"
+        elif "ALERTA" in rec['tipo']:
+            card_class = "recommendation-card recommendation-warning"
+        
+        badge_html = get_badge_html(rec['tipo'])
+        
+        tarjetas.append(f"""
+        <div class="{card_class}">
+            {badge_html}
+            <strong style="color: #000;">{rec['mensaje']}</strong><br>
+            <span style="color: #000; font-size: 0.9rem;">
+            📝 <em>Acción recomendada:</em> {rec['accion']}
+            </span>
+        </div>
+        """)
+    return ''.join(tarjetas)
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def intervenciones_minimas(firma, entradas):
+    """Cambios de menor costo para bajar el estrés de 40; se guardan por configuración y entradas"""
+    return sistema.buscar_intervenciones(*entradas, objetivo=40, max_resultados=3)
+
+def mostrar_diagnostico(entradas, considerar_incertidumbre):
+    resultado = sistema.diagnosticar(*entradas)
     
-    .alert-high {
-        border-left: 5px solid #ff4b4b !important;
-        background: linear-gradient(135deg, #fff5f5 0%, #ffeaea 100%);
-    }
+    if 'error' in resultado:
+        st.error(f"Error en el análisis: {resultado['error']}")
+        return
     
-    .alert-medium {
-        border-left: 5px solid #ffa500 !important;
-        background: linear-gradient(135deg, #fff9e6 0%, #fff2cc 100%);
-    }
+    # Mostrar métricas principales
+    st.success("✅ Diagnóstico completado")
     
-    .alert-low {
-        border-left: 5px solid #00cc96 !important;
-        background: linear-gradient(135deg, #f0fff4 0%, #e6ffec 100%);
-    }
+    col1, col2, col3 = st.columns(3)
     
-    /* Tarjetas de recomendaciones */
-    .recommendation-card {
-        background: white;
-        padding: 1.5rem;
-        margin: 1rem 0;
-        border-radius: 12px;
-        border: 1px solid #e0e0e0;
-        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.05);
-        border-left: 4px solid #667eea;
-    }
+    # Determinar clases de alerta
+    estres_class = "alert-high" if resultado['nivel_estres'] > 70 else "alert-medium" if resultado['nivel_estres'] > 40 else "alert-low"
+    prod_class = "alert-high" if resultado['productividad'] < 50 else "alert-low"
+    prior_class = "alert-high" if resultado['prioridad_accion'] > 7 else "alert-medium" if resultado['prioridad_accion'] > 5 else "alert-low"
     
-    .recommendation-critical {
-        border-left: 4px solid #ff4b4b;
-        background: linear-gradient(135deg, #fff5f5 0%, #ffeaea 100%);
-        animation: pulse 2s infinite;
-    }
+    with col1:
+        st.markdown(f'<div class="metric-card {estres_class}">', unsafe_allow_html=True)
+        st.metric("Nivel de Estrés", f"{resultado['nivel_estres']:.1f}%")
+        st.progress(resultado['nivel_estres'] / 100)
+        st.markdown('</div>', unsafe_allow_html=True)
     
-    .recommendation-warning {
-        border-left: 4px solid #ffa500;
-        background: linear-gradient(135deg, #fff9e6 0%, #fff2cc 100%);
-    }
+    with col2:
+        st.markdown(f'<div class="metric-card {prod_class}">', unsafe_allow_html=True)
+        st.metric("Productividad Estimada", f"{resultado['productividad']:.1f}%")
+        st.progress(resultado['productividad'] / 100)
+        st.markdown('</div>', unsafe_allow_html=True)
     
-    /* Animaciones */
-    @keyframes pulse {
-        0% { box-shadow: 0 0 0 0 rgba(255, 75, 75, 0.4); }
-        70% { box-shadow: 0 0 0 10px rgba(255, 75, 75, 0); }
-        100% { box-shadow: 0 0 0 0 rgba(255, 75, 75, 0); }
-    }
+    with col3:
+        st.markdown(f'<div class="metric-card {prior_class}">', unsafe_allow_html=True)
+        st.metric("Prioridad de Acción", f"{resultado['prioridad_accion']:.1f}/10")
+        st.progress(resultado['prioridad_accion'] / 10)
+        st.markdown('</div>', unsafe_allow_html=True)
     
-    /* Mejoras para los sliders */
-    .stSlider > div > div > div {
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-    }
+    # Gráfico radial
+    st.subheader("📈 Perfil de Bienestar")
+    st.plotly_chart(figura_perfil(sistema.firma, entradas), width='stretch')
     
-    /* Botones personalizados */
-    .stButton > button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        border-radius: 8px;
-        padding: 0.5rem 2rem;
-        font-weight: 600;
-        transition: all 0.3s ease;
-    }
+    if considerar_incertidumbre:
+        incierto = sistema.diagnosticar_incierto(*entradas)
+        st.subheader("🎲 Incertidumbre del Diagnóstico")
+        col_a, col_b, col_c = st.columns(3)
+        estres = incierto['nivel_estres']['percentiles']
+        prioridad = incierto['prioridad_accion']['percentiles']
+        col_a.metric("Estrés (rango 5–95%)", f"{estres[5]:.1f} – {estres[95]:.1f}%")
+        col_b.metric("Probabilidad de estrés > 70", f"{incierto['prob_estres_alto']:.0%}")
+        col_c.metric("Prioridad (rango 5–95%)", f"{prioridad[5]:.1f} – {prioridad[95]:.1f}")
     
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 4px 12px rgba(102, 126, 234, 0.4);
-    }
+    # Cambios concretos de menor costo para bajar el estrés
+    if resultado['nivel_estres'] >= 40:
+        intervenciones = intervenciones_minimas(sistema.firma, entradas)
+        st.subheader("🔧 Cambios Mínimos para Bajar el Estrés de 40")
+        if intervenciones:
+            for intervencion in intervenciones:
+                st.markdown(f"- {intervencion['descripcion']} → estrés "
+                            f"**{intervencion['nivel_estres']:.1f}%**")
+        else:
+            st.caption("Ninguna combinación de las entradas que cubren las reglas lleva el estrés por debajo de 40.")
     
-    /* Mejora del sidebar */
-    .css-1d391kg {
-        background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
-    }
+    # Recomendaciones
+    st.markdown('<div class="section-title">💡 Plan de Acción Personalizado</div>', unsafe_allow_html=True)
+    st.markdown(tarjetas_recomendaciones(sistema.firma, entradas), unsafe_allow_html=True)
+
+def mostrar_historial(entradas):
+    # Diagnósticos semanales guardados para ver la tendencia
+    st.header("📅 Mi Historial")
+    col_id, col_guardar = st.columns([3, 1])
+    empleado = col_id.text_input("Identificador de empleado:", help="Con él se guardan y consultan tus semanas")
+    if not empleado:
+        st.caption("Escribe tu identificador para guardar el diagnóstico de esta semana y ver tu tendencia.")
+        return
     
-    /* Títulos de secciones */
-    .section-title {
-        font-size: 1.5rem;
-        color: #333;
-        margin: 1.5rem 0 1rem 0;
-        padding-bottom: 0.5rem;
-        border-bottom: 2px solid #667eea;
-        font-weight: 600;
-    }
+    semana = semana_iso()
+    if col_guardar.button(f"💾 Guardar semana {semana}"):
+        datos = pd.DataFrame([dict(zip(NOMBRES_ENTRADAS, entradas), **{COLUMNA_EMPLEADO: empleado})])
+        try:
+            historial.registrar_semana(semana, datos, sistema)
+        except ValueError as error:
+            st.error(f"No se pudo guardar: {error}")
     
-    /* Badges para tipos de recomendación */
-    .badge {
-        display: inline-block;
-        padding: 0.25rem 0.75rem;
-        border-radius: 20px;
-        font-size: 0.75rem;
-        font-weight: 600;
-        margin-right: 0.5rem;
-    }
+    tendencia = historial.tendencia(empleado)
+    if tendencia.empty:
+        st.caption("Todavía no hay semanas guardadas con este identificador.")
+        return
     
-    .badge-critical {
-        background: #ff4b4b;
-        color: white;
-    }
+    ultima = tendencia.iloc[-1]
+    col_a, col_b, col_c = st.columns(3)
+    col_a.metric("Estrés medio (4 semanas)", f"{ultima['media_estres_4_semanas']:.1f}%")
+    col_b.metric("Cambio frente a la semana anterior",
+                 "—" if pd.isna(ultima['variacion_semanal']) else f"{ultima['variacion_semanal']:+.1f}",
+                 delta_color='inverse')
+    col_c.metric("Semanas seguidas con estrés > 70", int(ultima['semanas_estres_alto']))
     
-    .badge-warning {
-        background: #ffa500;
-        color: white;
-    }
+    fig_tendencia = go.Figure()
+    fig_tendencia.add_trace(go.Scatter(x=tendencia.index, y=tendencia['nivel_estres'], mode='lines+markers',
+                                       name='Estrés', line=dict(color='#1f77b4'), connectgaps=False))
+    fig_tendencia.add_trace(go.Scatter(x=tendencia.index, y=tendencia['media_estres_4_semanas'], mode='lines',
+                                       name='Media 4 semanas', line=dict(color='#ff9800', dash='dash')))
+    fig_tendencia.add_hline(y=70, line=dict(color='#f44336', dash='dot'))
+    fig_tendencia.update_layout(
+        yaxis=dict(title='Nivel de estrés (%)', range=[0, 100]),
+        height=350
+    )
+    st.plotly_chart(fig_tendencia, width='stretch')
+
+def mostrar_sensibilidad(actuales):
+    # Mapa de sensibilidad: cómo cambian las salidas al mover dos entradas
+    st.header("🗺️ Sensibilidad")
+    col_x, col_y, col_salida = st.columns(3)
+    eje_x = col_x.selectbox("Eje horizontal:", list(NOMBRES_ENTRADAS), format_func=NOMBRES_ENTRADAS.get)
+    eje_y = col_y.selectbox("Eje vertical:", [v for v in NOMBRES_ENTRADAS if v != eje_x], format_func=NOMBRES_ENTRADAS.get)
+    salida = col_salida.radio("Mostrar:", ['nivel_estres', 'productividad'], horizontal=True,
+                              format_func={'nivel_estres': "Estrés", 'productividad': "Productividad"}.get)
     
-    .badge-info {
-        background: #667eea;
-        color: white;
-    }
+    fijos = tuple((nombre, valor) for nombre, valor in actuales.items() if nombre not in (eje_x, eje_y))
+    valores_x, valores_y, estres_malla, productividad_malla = calcular_sensibilidad(sistema.firma, eje_x, eje_y, fijos)
     
-    .badge-success {
-        background: #00cc96;
-        color: white;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# Inicializar sistema de lógica difusa
-@st.cache_resource
-def cargar_sistema():
-    return SistemaBienestarLaboral()
+    fig_sensibilidad = go.Figure(go.Contour(
+        z=estres_malla if salida == 'nivel_estres' else productividad_malla,
+        x=valores_x,
+        y=valores_y,
+        colorscale='RdYlGn_r' if salida == 'nivel_estres' else 'RdYlGn',
+        zmin=0,
+        zmax=100,
+        contours=dict(coloring='heatmap', showlabels=True),
+        colorbar=dict(title='%')
+    ))
+    fig_sensibilidad.add_trace(go.Scatter(
+        x=[actuales[eje_x]],
+        y=[actuales[eje_y]],
+        mode='markers',
+        marker=dict(symbol='x', size=14, color='black'),
+        name='Tu situación'
+    ))
+    fig_sensibilidad.update_layout(
+        xaxis_title=NOMBRES_ENTRADAS[eje_x],
+        yaxis_title=NOMBRES_ENTRADAS[eje_y],
+        showlegend=False,
+        height=450
+    )
+    st.plotly_chart(fig_sensibilidad, width='stretch')
+    st.caption("La ✕ marca tu situación actual; las demás entradas quedan fijas en los valores elegidos arriba.")
 
-sistema = cargar_sistema()
+@st.fragment
+def panel_diagnostico():
+    # Formulario de entrada
+    st.header("🎯 Diagnóstico Personal")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("📊 Datos Laborales")
+        horas_trabajo = st.slider("Horas de trabajo semanales:", 0, 80, 40, 
+                                 help="Total de horas trabajadas en la semana")
+        carga_mental = st.slider("Nivel de carga mental:", 1, 10, 5,
+                                help="1 = Muy baja, 10 = Muy alta")
+        satisfaccion = st.slider("Satisfacción laboral:", 1, 10, 7,
+                                help="1 = Muy insatisfecho, 10 = Muy satisfecho")
+    
+    with col2:
+        st.subheader("😴 Bienestar Personal")
+        calidad_sueno = st.slider("Calidad del sueño:", 1, 10, 6,
+                                 help="1 = Muy mala, 10 = Excelente")
+        considerar_incertidumbre = st.checkbox("Considerar incertidumbre (±1 en las valoraciones)",
+                                               help="Muestra cuánto puede variar el resultado si tus "
+                                                    "valoraciones de 1 a 10 fueran un punto más o menos")
+        en_vivo = st.toggle("Actualizar en vivo",
+                            help="Diagnostica al soltar los controles, sin pulsar el botón")
+        
+        # Información adicional
+        st.info("""
+        **Instrucciones:**
+        - Evalúa honestamente cada aspecto
+        - Considera las últimas 2 semanas
+        - Los resultados son confidenciales
+        """)
+    
+    entradas = (horas_trabajo, calidad_sueno, carga_mental, satisfaccion)
+    
+    # Botón de diagnóstico
+    if en_vivo:
+        # Esperar a que los controles se queden quietos antes de calcular; las
+        # ejecuciones que no mueven ningún control no esperan
+        if st.session_state.get('entradas_en_vivo') != entradas:
+            time.sleep(ESPERA_EN_VIVO)
+            st.session_state['entradas_en_vivo'] = entradas
+        mostrar_diagnostico(entradas, considerar_incertidumbre)
+    elif st.button("🎯 Realizar Diagnóstico", type="primary"):
+        with st.spinner("Analizando tu bienestar laboral..."):
+            mostrar_diagnostico(entradas, considerar_incertidumbre)
+    
+    mostrar_historial(entradas)
+    mostrar_sensibilidad(dict(zip(NOMBRES_ENTRADAS, entradas)))
 
 # Header principal
 st.markdown('<h1 class="main-header">💼 Mi Bienestar Laboral</h1>', unsafe_allow_html=True)
 
-# Formulario de entrada
-st.header("🎯 Diagnóstico Personal")
-
-col1, col2 = st.columns(2)
-
-with col1:
-    st.subheader("📊 Datos Laborales")
-    horas_trabajo = st.slider("Horas de trabajo semanales:", 0, 80, 40, 
-                             help="Total de horas trabajadas en la semana")
-    carga_mental = st.slider("Nivel de carga mental:", 1, 10, 5,
-                            help="1 = Muy baja, 10 = Muy alta")
-    satisfaccion = st.slider("Satisfacción laboral:", 1, 10, 7,
-                            help="1 = Muy insatisfecho, 10 = Muy satisfecho")
-
-with col2:
-    st.subheader("😴 Bienestar Personal")
-    calidad_sueno = st.slider("Calidad del sueño:", 1, 10, 6,
-                             help="1 = Muy mala, 10 = Excelente")
-    
-    # Información adicional
-    st.info("""
-    **Instrucciones:**
-    - Evalúa honestamente cada aspecto
-    - Considera las últimas 2 semanas
-    - Los resultados son confidenciales
-    """)
-
-# Botón de diagnóstico
-if st.button("🎯 Realizar Diagnóstico", type="primary"):
-    with st.spinner("Analizando tu bienestar laboral..."):
-        resultado = sistema.diagnosticar(horas_trabajo, calidad_sueno, carga_mental, satisfaccion)
-        
-        if 'error' in resultado:
-            st.error(f"Error en el análisis: {resultado['error']}")
-        else:
-            # Mostrar métricas principales
-            st.success("✅ Diagnóstico completado")
-            
-            col1, col2, col3 = st.columns(3)
-            
-            # Determinar clases de alerta
-            estres_class = "alert-high" if resultado['nivel_estres'] > 70 else "alert-medium" if resultado['nivel_estres'] > 40 else "alert-low"
-            prod_class = "alert-high" if resultado['productividad'] < 50 else "alert-low"
-            prior_class = "alert-high" if resultado['prioridad_accion'] > 7 else "alert-medium" if resultado['prioridad_accion'] > 5 else "alert-low"
-            
-            with col1:
-                st.markdown(f'<div class="metric-card {estres_class}">', unsafe_allow_html=True)
-                st.metric("Nivel de Estrés", f"{resultado['nivel_estres']:.1f}%")
-                st.progress(resultado['nivel_estres'] / 100)
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown(f'<div class="metric-card {prod_class}">', unsafe_allow_html=True)
-                st.metric("Productividad Estimada", f"{resultado['productividad']:.1f}%")
-                st.progress(resultado['productividad'] / 100)
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            with col3:
-                st.markdown(f'<div class="metric-card {prior_class}">', unsafe_allow_html=True)
-                st.metric("Prioridad de Acción", f"{resultado['prioridad_accion']:.1f}/10")
-                st.progress(resultado['prioridad_accion'] / 10)
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            # Gráfico radial
-            st.subheader("📈 Perfil de Bienestar")
-            categorias = ['Estrés', 'Productividad', 'Sueño', 'Satisfacción', 'Carga Mental']
-            valores = [
-                resultado['nivel_estres'],
-                resultado['productividad'],
-                calidad_sueno * 10,  # Escalar a 100
-                satisfaccion * 10,   # Escalar a 100
-                carga_mental * 10    # Escalar a 100
-            ]
-            
-            fig = go.Figure(data=go.Scatterpolar(
-                r=valores,
-                theta=categorias,
-                fill='toself',
-                line=dict(color='#1f77b4')
-            ))
-            
-            fig.update_layout(
-                polar=dict(
-                    radialaxis=dict(
-                        visible=True,
-                        range=[0, 100]
-                    )),
-                showlegend=False,
-                height=400
-            )
-            
-            st.plotly_chart(fig, width='stretch')
-            
-            # Recomendaciones
-            st.markdown('<div class="section-title">💡 Plan de Acción Personalizado</div>', unsafe_allow_html=True)
-            
-            for rec in resultado['recomendaciones']:
-                # Determinar clase CSS según criticidad
-                card_class = "recommendation-card"
-                if "CRÍTICO" in rec['tipo'] or "PRIORIDAD" in rec['tipo']:
-                    card_class = "recommendation-card recommendation-critical"
-                elif "ALERTA" in rec['tipo']:
-                    card_class = "recommendation-card recommendation-warning"
-                
-                badge_html = get_badge_html(rec['tipo'])
-                
-                st.markdown(f"""
-                <div class="{card_class}">
-                    {badge_html}
-                    <strong style="color: #000;">{rec['mensaje']}</strong><br>
-                    <span style="color: #000; font-size: 0.9rem;">
-                    📝 <em>Acción recomendada:</em> {rec['accion']}
-                    </span>
-                </div>
-                """, unsafe_allow_html=True)
+panel_diagnostico()
 
 # Footer
 st.markdown("---")
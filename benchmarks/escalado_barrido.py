@@ -0,0 +1,76 @@
+"""Escalado de barrer_poblacion y barrer_malla con 1, 2, 4 y 8 procesos.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.escalado_barrido
+    python -m benchmarks.escalado_barrido --filas 2000000 --paso 0.5 --trabajadores 1 2 4 8 16
+
+Para cada número de procesos mide filas por segundo (incluido el arranque
+del pool), la aceleración frente a un proceso y la eficiencia
+(aceleración / procesos). Comprueba además que todos los resultados son
+idénticos al de un proceso.
+"""
+import argparse
+import os
+import statistics
+import time
+
+import numpy as np
+
+from utils.barrido import barrer_malla, barrer_poblacion
+
+TRABAJADORES = (1, 2, 4, 8)
+
+
+def medir(funcion, trabajadores, repeticiones):
+    """Devuelve (segundos, resultado) con la mediana de `repeticiones` ejecuciones"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(trabajadores)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos), resultado
+
+
+def escalar(nombre, funcion, lista_trabajadores, repeticiones):
+    print(f"\n{nombre}")
+    print(f"{'procesos':>8} | {'segundos':>8} | {'filas/s':>10} | {'aceleración':>11} | {'eficiencia':>10}")
+    print("-" * 60)
+    base = referencia = None
+    for trabajadores in lista_trabajadores:
+        segundos, resultado = medir(funcion, trabajadores, repeticiones)
+        if referencia is None:
+            base, referencia = segundos, resultado
+        elif not all(np.array_equal(referencia[k], resultado[k]) for k in referencia):
+            raise AssertionError(f"{nombre}: el resultado con {trabajadores} procesos difiere del de uno")
+        filas = resultado['nivel_estres'].size
+        aceleracion = base / segundos
+        print(f"{trabajadores:>8} | {segundos:>8.2f} | {filas / segundos:>10,.0f} | {aceleracion:>10.2f}x | "
+              f"{aceleracion / trabajadores:>10.0%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filas', type=int, default=500_000, help='Filas de la población simulada')
+    parser.add_argument('--paso', type=float, default=1.0, help='Paso de la malla completa')
+    parser.add_argument('--trabajadores', type=int, nargs='+', default=TRABAJADORES)
+    parser.add_argument('--motor', choices=('compilado', 'tabla'), default='compilado')
+    parser.add_argument('--repeticiones', type=int, default=3)
+    args = parser.parse_args(argv)
+    print(f"CPU disponibles: {os.cpu_count()}; motor {args.motor}")
+
+    rng = np.random.default_rng(0)
+    poblacion = (
+        rng.uniform(0, 80, args.filas),
+        rng.uniform(1, 10, args.filas),
+        rng.uniform(1, 10, args.filas),
+        rng.uniform(1, 10, args.filas),
+    )
+    escalar(f'Población simulada ({args.filas:,} filas)', lambda n: barrer_poblacion(*poblacion, trabajadores=n, motor=args.motor),
+            args.trabajadores, args.repeticiones)
+    escalar(f'Malla completa (paso {args.paso:g})',
+            lambda n: barrer_malla(args.paso, trabajadores=n, motor=args.motor)[1],
+            args.trabajadores, args.repeticiones)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Latencia del centroide muestreado frente al analítico según la resolución.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.resolucion_centroide
+"""
+import time
+
+import numpy as np
+
+from utils.fuzzy_system import SistemaBienestarLaboral
+
+RESOLUCIONES = (1.0, 0.5, 0.1, 0.05, 0.01)
+LLAMADAS = 300
+FILAS_LOTE = 5000
+
+
+def medir(sistema, entradas):
+    """Devuelve (µs por llamada a diagnosticar, µs por fila en diagnosticar_lote)"""
+    inicio = time.perf_counter()
+    for i in range(LLAMADAS):
+        sistema.diagnosticar(*(float(v[i]) for v in entradas))
+    individual = (time.perf_counter() - inicio) / LLAMADAS * 1e6
+
+    inicio = time.perf_counter()
+    sistema.diagnosticar_lote(*entradas)
+    lote = (time.perf_counter() - inicio) / FILAS_LOTE * 1e6
+    return individual, lote
+
+
+def main():
+    rng = np.random.default_rng(0)
+    entradas = (
+        rng.uniform(0, 80, FILAS_LOTE),
+        rng.uniform(1, 10, FILAS_LOTE),
+        rng.uniform(1, 10, FILAS_LOTE),
+        rng.uniform(1, 10, FILAS_LOTE),
+    )
+
+    print(f"{'resolución':>10} | {'centroide':>10} | {'µs/llamada':>10} | {'µs/fila lote':>12}")
+    print("-" * 52)
+    for resolucion in RESOLUCIONES:
+        for centroide in ('muestreado', 'analitico'):
+            sistema = SistemaBienestarLaboral(motor='compilado', resolucion=resolucion, centroide=centroide)
+            individual, lote = medir(sistema, entradas)
+            print(f"{resolucion:>10} | {centroide:>10} | {individual:>10.1f} | {lote:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,260 @@
+"""Suite de benchmarks de SistemaBienestarLaboral con comparación contra una base.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.suite -o resultados.json
+    python -m benchmarks.suite --comparar base.json --umbral 0.2 --umbral construccion_s=0.5
+
+Mide el arranque de un proceso nuevo (con y sin artefacto guardado), el
+tiempo de construcción, la latencia en frío y en caliente de diagnosticar
+por motor, la latencia del camino de respaldo, de diagnosticar_incierto y
+de buscar_intervenciones,
+el rendimiento del barrido de la malla entera completa y el pico de
+memoria del barrido, y la memoria por fila de diagnosticar_compacto.
+Con --comparar termina con código 1 si alguna métrica empeora más que su
+umbral (fracción relativa). El presupuesto de memoria por fila de
+diagnosticar_compacto se comprueba en tests/test_resultado_lote.py.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from utils.fuzzy_system import SistemaBienestarLaboral
+
+MOTORES_MEDIDOS = ('skfuzzy', 'compilado', 'tabla')
+UMBRAL_POR_DEFECTO = 0.2
+
+# Filas de la medición de diagnosticar_compacto
+FILAS_COMPACTO = 1_000_000
+
+# Entradas cubiertas por las reglas y una que va directo al respaldo
+ENTRADA_TIPICA = (40, 6, 5, 7)
+ENTRADA_RESPALDO = (45, 9, 1, 9)
+
+# Proceso nuevo que importa el módulo, crea el sistema y atiende un diagnóstico
+_SCRIPT_ARRANQUE = """
+import sys
+from utils.fuzzy_system import SistemaBienestarLaboral
+SistemaBienestarLaboral(motor='compilado', directorio_artefacto=sys.argv[1] or None).diagnosticar(40, 6, 5, 7)
+"""
+
+
+def _crear(motor):
+    return SistemaBienestarLaboral(motor=motor, directorio_tabla=None)
+
+
+def _mediana_us(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1e6
+
+
+def _entradas_distintas(cantidad, semilla=0):
+    rng = np.random.default_rng(semilla)
+    return [
+        (int(rng.integers(0, 81)), int(rng.integers(1, 11)), int(rng.integers(1, 11)), int(rng.integers(1, 11)))
+        for _ in range(cantidad)
+    ]
+
+
+def medir_arranque(repeticiones):
+    """Segundos desde que arranca un proceso nuevo hasta su primer diagnóstico"""
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def arrancar(directorio):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, '-c', _SCRIPT_ARRANQUE, directorio], cwd=raiz, check=True)
+        return time.perf_counter() - inicio
+
+    with tempfile.TemporaryDirectory() as directorio:
+        arrancar(directorio)  # Guarda el artefacto
+        return {
+            'arranque_sin_artefacto_s': statistics.median(arrancar('') for _ in range(repeticiones)),
+            'arranque_con_artefacto_s': statistics.median(arrancar(directorio) for _ in range(repeticiones)),
+        }
+
+
+def medir_construccion(repeticiones):
+    """Tiempo de construir el sistema (grafo de skfuzzy, plan compilado y mapa de cobertura)"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        SistemaBienestarLaboral()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def medir_latencias(motor, repeticiones):
+    """Latencias de diagnosticar (µs) para un motor"""
+    # En frío: primera llamada de una instancia recién creada
+    frias = []
+    for _ in range(max(3, repeticiones // 100)):
+        sistema = _crear(motor)
+        inicio = time.perf_counter()
+        sistema.diagnosticar(*ENTRADA_TIPICA)
+        frias.append(time.perf_counter() - inicio)
+
+    sistema = _crear(motor)
+    sistema.diagnosticar(*ENTRADA_TIPICA)
+    distintas = _entradas_distintas(repeticiones)
+    iterador = iter(distintas)
+    return {
+        f'{motor}.fria_us': statistics.median(frias) * 1e6,
+        f'{motor}.caliente_misma_entrada_us': _mediana_us(lambda: sistema.diagnosticar(*ENTRADA_TIPICA), repeticiones),
+        f'{motor}.caliente_entradas_distintas_us': _mediana_us(lambda: sistema.diagnosticar(*next(iterador)), repeticiones),
+        f'{motor}.respaldo_us': _mediana_us(lambda: sistema.diagnosticar(*ENTRADA_RESPALDO), repeticiones),
+    }
+
+
+def medir_incierto(repeticiones):
+    """Milisegundos de diagnosticar_incierto (2000 muestras) por motor"""
+    metricas = {}
+    for motor in ('compilado', 'tabla'):
+        sistema = _crear(motor)
+        metricas[f'{motor}.incierto_ms'] = _mediana_us(
+            lambda: sistema.diagnosticar_incierto(*ENTRADA_TIPICA, semilla=0), repeticiones
+        ) / 1e3
+    return metricas
+
+
+def medir_intervenciones(repeticiones):
+    """Milisegundos de buscar_intervenciones con la tabla de la malla ya construida"""
+    sistema = _crear('compilado')
+    sistema.buscar_intervenciones(*ENTRADA_TIPICA)
+    return {'intervenciones_ms': _mediana_us(lambda: sistema.buscar_intervenciones(60, 3, 8, 3), repeticiones) / 1e3}
+
+
+def medir_barrido():
+    """Rendimiento y pico de memoria de diagnosticar_lote sobre la malla entera completa"""
+    sistema = _crear('compilado')
+    malla = np.meshgrid(np.arange(81), np.arange(1, 11), np.arange(1, 11), np.arange(1, 11), indexing='ij')
+    filas = malla[0].size
+
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    sistema.diagnosticar_lote(*malla)
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'barrido_malla_filas_s': filas / segundos, 'barrido_malla_pico_mb': pico / 2**20}
+
+
+def medir_lote_compacto():
+    """Pico de memoria por fila y rendimiento de diagnosticar_compacto con un millón de filas"""
+    sistema = _crear('tabla')
+    rng = np.random.default_rng(0)
+    entradas = (
+        rng.integers(0, 81, FILAS_COMPACTO), rng.integers(1, 11, FILAS_COMPACTO),
+        rng.integers(1, 11, FILAS_COMPACTO), rng.integers(1, 11, FILAS_COMPACTO),
+    )
+
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    sistema.diagnosticar_compacto(*entradas)
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'lote_compacto_filas_s': FILAS_COMPACTO / segundos, 'lote_compacto_bytes_fila': pico / FILAS_COMPACTO}
+
+
+def ejecutar(repeticiones=300):
+    """Ejecuta todas las mediciones y devuelve el documento de resultados"""
+    metricas = medir_arranque(max(3, repeticiones // 100))
+    metricas['construccion_s'] = medir_construccion(max(3, repeticiones // 50))
+    for motor in MOTORES_MEDIDOS:
+        metricas.update(medir_latencias(motor, repeticiones))
+    metricas.update(medir_incierto(max(3, repeticiones // 20)))
+    metricas.update(medir_intervenciones(max(3, repeticiones // 20)))
+    metricas.update(medir_barrido())
+    metricas.update(medir_lote_compacto())
+
+    import skfuzzy
+    return {
+        'fecha': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'entorno': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'skfuzzy': skfuzzy.__version__,
+            'plataforma': platform.platform(),
+        },
+        'metricas': metricas,
+    }
+
+
+def _mayor_es_mejor(nombre):
+    return nombre.endswith('_filas_s')
+
+
+def comparar(actual, base, umbrales, umbral_por_defecto=UMBRAL_POR_DEFECTO):
+    """Compara métricas contra la base; devuelve una lista de (métrica, base, actual, cambio, regresión)"""
+    filas = []
+    for nombre, valor in actual['metricas'].items():
+        if nombre not in base['metricas']:
+            continue
+        referencia = base['metricas'][nombre]
+        cambio = (valor - referencia) / referencia if referencia else 0.0
+        # Cambio positivo = peor, sin importar la dirección de la métrica
+        empeora = -cambio if _mayor_es_mejor(nombre) else cambio
+        filas.append((nombre, referencia, valor, empeora, empeora > umbrales.get(nombre, umbral_por_defecto)))
+    return filas
+
+
+def _leer_umbrales(valores):
+    umbral_por_defecto, umbrales = UMBRAL_POR_DEFECTO, {}
+    for valor in valores or ():
+        if '=' in valor:
+            nombre, numero = valor.split('=', 1)
+            umbrales[nombre] = float(numero)
+        else:
+            umbral_por_defecto = float(valor)
+    return umbral_por_defecto, umbrales
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-o', '--salida', help='Guarda los resultados en este archivo JSON')
+    parser.add_argument('--comparar', help='Archivo JSON de base contra el que comparar')
+    parser.add_argument('--umbral', action='append',
+                        help=f'Empeoramiento relativo permitido (por defecto {UMBRAL_POR_DEFECTO}); '
+                             'también metrica=valor para una métrica concreta')
+    parser.add_argument('--repeticiones', type=int, default=300)
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(args.repeticiones)
+    texto = json.dumps(resultados, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            archivo.write(texto + '\n')
+    print(texto)
+
+    if not args.comparar:
+        return 0
+
+    with open(args.comparar, encoding='utf-8') as archivo:
+        base = json.load(archivo)
+    umbral_por_defecto, umbrales = _leer_umbrales(args.umbral)
+    regresiones = 0
+    print(f"\n{'métrica':<42} {'base':>12} {'actual':>12} {'cambio':>8}", file=sys.stderr)
+    for nombre, referencia, valor, empeora, regresion in comparar(resultados, base, umbrales, umbral_por_defecto):
+        marca = '  REGRESIÓN' if regresion else ''
+        print(f"{nombre:<42} {referencia:>12.3f} {valor:>12.3f} {empeora:>+8.1%}{marca}", file=sys.stderr)
+        regresiones += regresion
+    return 1 if regresiones else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+import os
+
+import plotly.graph_objects as go
+import streamlit as st
+from utils.cohortes import firma_contenido, leer_cohorte, resumir_cohorte
+from utils.configuracion import CONFIGURACION_BASE, VARIABLES_ENTRADA
+from utils.recarga import SistemaRecargable
+from utils.tabla_respuesta import DIRECTORIO_CACHE
+
+# Configuración de la página
+st.set_page_config(
+    page_title="Bienestar de la Organización",
+    page_icon="🏢",
+    layout="wide"
+)
+
+RUTA_ESTILOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets', 'style.css')
+
+@st.cache_resource
+def cargar_estilos():
+    with open(RUTA_ESTILOS, encoding='utf-8') as archivo:
+        return f"<style>\n{archivo.read()}</style>"
+
+st.markdown(cargar_estilos(), unsafe_allow_html=True)
+
+@st.cache_resource
+def cargar_sistema():
+    # Los archivos suelen traer valores decimales, donde la interpolación del
+    # motor de tabla se aleja del resultado exacto; el compilado con centroide
+    # analítico puntúa 100.000 filas en unas dos décimas de segundo
+    return SistemaRecargable(
+        os.environ.get('BIENESTAR_CONFIGURACION', CONFIGURACION_BASE),
+        motor='compilado', centroide='analitico', directorio_artefacto=DIRECTORIO_CACHE
+    )
+
+sistema = cargar_sistema()
+sistema.comprobar()
+if sistema.ultimo_error is not None:
+    st.warning(f"No se pudo recargar la configuración; se mantiene la anterior: {sistema.ultimo_error}")
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def resumir_archivo(firma_archivo, firma, formato, _contenido):
+    """Agregados de la cohorte; se guardan por el hash del contenido (no el nombre) y la configuración"""
+    return resumir_cohorte(sistema, leer_cohorte(_contenido, formato))
+
+# Header principal
+st.markdown('<h1 class="main-header">🏢 Bienestar de la Organización</h1>', unsafe_allow_html=True)
+
+archivo = st.file_uploader("Archivo de empleados (CSV o Parquet):", type=['csv', 'parquet'],
+                           help=f"Una fila por empleado con las columnas {', '.join(VARIABLES_ENTRADA)}; "
+                                "las demás columnas (identificador, equipo, ...) se muestran en la lista de riesgo")
+
+if archivo is None:
+    st.info(f"""
+    **Instrucciones:**
+    - Sube un archivo con una fila por empleado
+    - Columnas necesarias: {', '.join(VARIABLES_ENTRADA)}
+    - Los datos se procesan en el servidor y solo se muestran resúmenes
+    """)
+    st.stop()
+
+contenido = archivo.getvalue()
+formato = 'parquet' if archivo.name.endswith('.parquet') else 'csv'
+try:
+    with st.spinner("Analizando la cohorte..."):
+        resumen = resumir_archivo(firma_contenido(contenido), sistema.firma, formato, contenido)
+except Exception as error:
+    st.error(f"No se pudo analizar el archivo: {error}")
+    st.stop()
+
+if resumen['invalidas']:
+    with st.expander(f"⚠️ {resumen['invalidas']:,} filas no se pudieron diagnosticar"):
+        for mensaje, cantidad in resumen['errores'].items():
+            st.markdown(f"- {mensaje}: {cantidad:,}")
+
+# Métricas principales
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Empleados", f"{resumen['filas'] - resumen['invalidas']:,}")
+col2.metric("Estrés medio", f"{resumen['estres_medio']:.1f}%",
+            help=f"Mediana: {resumen['estres_mediano']:.1f}%")
+col3.metric("Con estrés crítico (> 70)", f"{resumen['proporcion_estres_alto']:.0%}")
+col4.metric("Productividad media", f"{resumen['productividad_media']:.1f}%")
+
+col_hist, col_bandas = st.columns([2, 1])
+
+with col_hist:
+    st.subheader("📊 Distribución del Estrés")
+    bordes, conteos = resumen['histograma_estres']
+    fig_estres = go.Figure(go.Bar(
+        x=(bordes[:-1] + bordes[1:]) / 2,
+        y=conteos,
+        width=bordes[1] - bordes[0],
+        marker=dict(color=(bordes[:-1] + bordes[1:]) / 2, colorscale='RdYlGn_r', cmin=0, cmax=100)
+    ))
+    fig_estres.update_layout(
+        xaxis_title="Nivel de estrés (%)",
+        yaxis_title="Empleados",
+        bargap=0.05,
+        height=400
+    )
+    st.plotly_chart(fig_estres, width='stretch')
+
+with col_bandas:
+    st.subheader("🚦 Prioridad de Acción")
+    fig_bandas = go.Figure(go.Bar(
+        x=list(resumen['bandas_prioridad']),
+        y=list(resumen['bandas_prioridad'].values()),
+        marker=dict(color=['#4caf50', '#ff9800', '#f44336'])
+    ))
+    fig_bandas.update_layout(
+        yaxis_title="Empleados",
+        height=400
+    )
+    st.plotly_chart(fig_bandas, width='stretch')
+
+st.markdown('<div class="section-title">🚨 Mayor Riesgo</div>', unsafe_allow_html=True)
+st.dataframe(resumen['mayor_riesgo'], use_container_width=True, hide_index=True)
+st.caption("Ordenados por prioridad de acción y, a igualdad, por nivel de estrés.")
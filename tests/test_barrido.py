@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from utils.barrido import barrer_malla, barrer_poblacion
+from utils.fuzzy_system import SistemaBienestarLaboral
+
+
+@pytest.fixture(scope='module')
+def cache(tmp_path_factory):
+    return str(tmp_path_factory.mktemp('cache'))
+
+
+@pytest.fixture(scope='module')
+def sistema(cache):
+    return SistemaBienestarLaboral(motor='compilado', directorio_artefacto=cache)
+
+
+def test_malla_incluye_los_extremos_con_paso_que_no_divide(sistema, cache):
+    ejes, resultado = barrer_malla(2.0, trabajadores=2, filas_por_tarea=997, directorio_cache=cache)
+    for eje, (minimo, maximo) in zip(ejes, sistema.limites):
+        assert eje[0] == minimo and eje[-1] == maximo
+        assert np.diff(eje).max() <= 2.0 + 1e-12
+    malla = np.meshgrid(*ejes, indexing='ij')
+    esperado = sistema.diagnosticar_lote(*malla)
+    for nombre, valores in esperado.items():
+        np.testing.assert_array_equal(resultado[nombre], valores)
+
+
+def test_poblacion_coincide_con_un_solo_proceso(sistema, cache):
+    generador = np.random.default_rng(7)
+    entradas = [generador.uniform(minimo, maximo, 5_000) for minimo, maximo in sistema.limites]
+    entradas[0][:3] = np.nan
+    resultado = barrer_poblacion(*entradas, trabajadores=2, filas_por_tarea=1_000, directorio_cache=cache)
+    esperado = sistema.diagnosticar_lote(*entradas)
+    for nombre, valores in esperado.items():
+        np.testing.assert_array_equal(resultado[nombre], valores)
@@ -0,0 +1,24 @@
+import json
+
+import numpy as np
+
+from utils.configuracion import CONFIGURACION_BASE, VARIABLES_ENTRADA
+from utils.fuzzy_system import SistemaBienestarLaboral
+
+
+def test_cobertura_exacta_con_vertices_fuera_de_las_muestras():
+    """Con vértices entre muestras del universo el mapa sigue a la pertenencia interpolada"""
+    with open(CONFIGURACION_BASE, encoding='utf-8') as archivo:
+        configuracion = json.load(archivo)
+    terminos = configuracion['variables']['horas_trabajo']['terminos']
+    terminos['normales']['puntos'] = [30.5, 40, 50, 60.5]
+    terminos['altas']['puntos'] = [62, 70, 80, 80]
+    sistema = SistemaBienestarLaboral(motor='compilado', configuracion=configuracion)
+
+    generador = np.random.default_rng(0)
+    entradas = {
+        nombre: generador.uniform(minimo, maximo, 200_000)
+        for nombre, (minimo, maximo) in zip(VARIABLES_ENTRADA, sistema.limites)
+    }
+    activas = np.logical_and.reduce(list(sistema.plan.activaciones(entradas).values()))
+    np.testing.assert_array_equal(sistema.cobertura.cubre_lote(entradas), activas)
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from utils.cohortes import BANDAS_PRIORIDAD, resumir_cohorte
+from utils.fuzzy_system import SistemaBienestarLaboral
+
+
+def test_filas_no_finitas_no_entran_en_los_agregados():
+    generador = np.random.default_rng(4)
+    datos = pd.DataFrame({
+        'id_empleado': np.arange(1_000),
+        'horas_trabajo': generador.uniform(20, 70, 1_000),
+        'calidad_sueno': generador.uniform(1, 10, 1_000),
+        'carga_mental': generador.uniform(1, 10, 1_000),
+        'satisfaccion': generador.uniform(1, 10, 1_000),
+    })
+    datos.loc[3, 'horas_trabajo'] = np.inf
+    datos.loc[7, 'carga_mental'] = np.nan
+    resumen = resumir_cohorte(SistemaBienestarLaboral(motor='compilado'), datos)
+
+    assert resumen['invalidas'] == 2
+    assert sum(resumen['errores'].values()) == 2
+    assert np.isfinite([resumen['estres_medio'], resumen['estres_mediano'], resumen['productividad_media']]).all()
+    _, conteos = resumen['histograma_estres']
+    assert conteos.sum() == sum(resumen['bandas_prioridad'][banda] for banda in BANDAS_PRIORIDAD) == 998
+    assert not resumen['mayor_riesgo']['id_empleado'].isin([3, 7]).any()
@@ -0,0 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from utils.fuzzy_system import TOLERANCIA_LOTE, SistemaBienestarLaboral
+
+HILOS = 16
+DIAGNOSTICOS_POR_HILO = 250
+
+
+def test_diagnosticar_concurrente_con_pool_pequeno():
+    """Más hilos que simuladores: cada hilo recibe el resultado de sus propias entradas"""
+    sistema = SistemaBienestarLaboral(motor='skfuzzy', tamano_pool=4)
+    generador = np.random.default_rng(3)
+    total = HILOS * DIAGNOSTICOS_POR_HILO
+    entradas = np.column_stack([
+        generador.uniform(minimo, maximo, total) for minimo, maximo in sistema.limites
+    ])
+    esperado = sistema.diagnosticar_lote(*entradas.T)
+    previos = sistema.estadisticas_caminos()['total']
+
+    def diagnosticar_tramo(hilo):
+        tramo = range(hilo * DIAGNOSTICOS_POR_HILO, (hilo + 1) * DIAGNOSTICOS_POR_HILO)
+        return [(i, sistema.diagnosticar(*entradas[i])) for i in tramo]
+
+    with ThreadPoolExecutor(HILOS) as hilos:
+        resultados = [par for tramo in hilos.map(diagnosticar_tramo, range(HILOS)) for par in tramo]
+
+    assert len(resultados) == total
+    for i, resultado in resultados:
+        for salida in ('nivel_estres', 'productividad', 'prioridad_accion'):
+            assert resultado[salida] == pytest.approx(esperado[salida][i], abs=TOLERANCIA_LOTE), (salida, entradas[i])
+        assert ('advertencia' in resultado) == esperado['respaldo'][i], entradas[i]
+    assert sistema.estadisticas_caminos()['total'] - previos == total
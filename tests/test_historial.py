@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.fuzzy_system import COLUMNAS_ENTRADA, SistemaBienestarLaboral
+from utils.historial import HistorialBienestar
+
+
+@pytest.fixture(scope='module')
+def sistema():
+    return SistemaBienestarLaboral(motor='compilado')
+
+
+def _semana(ids, horas):
+    return pd.DataFrame({
+        'id_empleado': ids,
+        'horas_trabajo': horas,
+        'calidad_sueno': 4,
+        'carga_mental': 8,
+        'satisfaccion': 3,
+    })
+
+
+def test_semanas_y_estadisticas_moviles(tmp_path, sistema):
+    historial = HistorialBienestar(tmp_path, capacidad_inicial=2)
+    assert historial.registrar_semana('2026-W40', _semana(['a', 'b'], [40, 70]), sistema) == 2
+    assert historial.registrar_semana('2026-W41', _semana(['a', 'b', 'c'], [45, 72, 50]), sistema) == 3
+
+    tendencia = HistorialBienestar(tmp_path).tendencia('a')
+    assert tendencia.index.tolist() == ['2026-W40', '2026-W41']
+    estres = tendencia['nivel_estres'].to_numpy()
+    assert tendencia['media_estres_4_semanas'].iloc[-1] == pytest.approx(estres.mean(), rel=1e-6)
+    assert tendencia['variacion_semanal'].iloc[-1] == pytest.approx(estres[1] - estres[0], rel=1e-5)
+    assert HistorialBienestar(tmp_path).tendencia('c').index.tolist() == ['2026-W41']
+    with pytest.raises(ValueError):
+        historial.registrar_semana('2026-W39', _semana(['a'], [40]), sistema)
+
+
+def test_entradas_no_finitas_quedan_sin_diagnostico(tmp_path, sistema):
+    historial = HistorialBienestar(tmp_path)
+    datos = _semana(['a', 'b', 'c', 'd'], [40, np.inf, -np.inf, np.nan])
+    assert historial.registrar_semana('2026-W40', datos, sistema) == 1
+
+    semana = historial.datos_semana()
+    assert semana['id_empleado'].tolist() == ['a']
+    columnas = [*COLUMNAS_ENTRADA, 'nivel_estres', 'productividad', 'prioridad_accion']
+    assert np.isfinite(semana[columnas].to_numpy(dtype=float)).all()
+    assert historial.tendencia('b').empty
@@ -0,0 +1,48 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from utils.fuzzy_system import TOLERANCIA_LOTE, SistemaBienestarLaboral
+
+
+@pytest.fixture(scope='module')
+def sistema():
+    return SistemaBienestarLaboral()
+
+
+def test_lote_coincide_con_diagnosticar_en_la_malla_entera(sistema):
+    """Las 81.000 combinaciones enteras: mismas salidas, respaldos y recomendaciones que skfuzzy"""
+    ejes = [np.arange(minimo, maximo + 1) for minimo, maximo in sistema.limites]
+    malla = np.array(list(itertools.product(*ejes)), dtype=float)
+    assert len(malla) == 81_000
+
+    lote = sistema.diagnosticar_lote(*malla.T)
+    recomendaciones = sistema.recomendaciones_lote(
+        lote['nivel_estres'], lote['productividad'], lote['prioridad_accion']
+    )
+    for i, entradas in enumerate(malla):
+        esperado = sistema.diagnosticar(*entradas)
+        for salida in ('nivel_estres', 'productividad', 'prioridad_accion'):
+            assert lote[salida][i] == pytest.approx(esperado[salida], abs=TOLERANCIA_LOTE), (salida, entradas)
+        assert lote['respaldo'][i] == ('advertencia' in esperado), entradas
+        assert recomendaciones[i] == esperado['recomendaciones'], entradas
+
+
+
+def test_filas_no_finitas_devuelven_nan(sistema):
+    resultado = sistema.diagnosticar_lote([np.nan, 40, np.inf], [5, 6, 5], [5, 5, 5], [5, 7, 5])
+    assert np.isnan(resultado['nivel_estres'][[0, 2]]).all()
+    assert np.isnan(resultado['productividad'][[0, 2]]).all()
+    assert not resultado['respaldo'].any()
+    assert resultado['nivel_estres'][1] == pytest.approx(sistema.diagnosticar(40, 6, 5, 7)['nivel_estres'],
+                                                         abs=TOLERANCIA_LOTE)
+
+
+def test_malla_sensibilidad_exige_las_entradas_fijas(sistema):
+    with pytest.raises(ValueError, match='satisfaccion'):
+        sistema.malla_sensibilidad('horas_trabajo', 'calidad_sueno', {'carga_mental': 5})
+    _, _, resultado = sistema.malla_sensibilidad('horas_trabajo', 'calidad_sueno',
+                                                 {'carga_mental': 5, 'satisfaccion': 7}, puntos=5)
+    assert resultado['nivel_estres'].shape == (5, 5)
+    assert np.isfinite(resultado['nivel_estres']).all()
@@ -0,0 +1,32 @@
+import pytest
+
+from utils.fuzzy_system import SistemaBienestarLaboral
+from utils.instrumentacion import Instrumentacion
+
+
+@pytest.fixture(scope='module')
+def sistema():
+    return SistemaBienestarLaboral(motor='compilado', directorio_tabla=None)
+
+
+@pytest.mark.parametrize('actual', [(40, 6, 5, 7), (60, 3, 8, 3), (70, 9, 3, 7), (50, 6, 8, 3)])
+def test_intervenciones_solo_del_sistema_difuso(sistema, actual):
+    intervenciones = sistema.buscar_intervenciones(*actual, objetivo=40)
+    assert intervenciones
+    for intervencion in intervenciones:
+        assert not intervencion['respaldo']
+        assert intervencion['nivel_estres'] < 40
+        verificado = sistema.diagnosticar(*intervencion['entradas'].values())
+        assert 'advertencia' not in verificado
+        assert verificado['nivel_estres'] == pytest.approx(intervencion['nivel_estres'])
+
+
+@pytest.mark.parametrize('motor', ['compilado', 'tabla'])
+def test_tabla_y_verificaciones_no_cuentan_como_diagnosticos(motor):
+    instrumentacion = Instrumentacion()
+    sistema = SistemaBienestarLaboral(motor=motor, directorio_tabla=None, instrumentacion=instrumentacion)
+    sistema.diagnosticar(40, 6, 5, 7)
+    sistema.buscar_intervenciones(40, 6, 5, 7)
+
+    assert sistema.estadisticas_caminos()['total'] == 1
+    assert sum(instrumentacion.resumen()['contadores'].values()) == 1
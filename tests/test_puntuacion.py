@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+from pandas.errors import ParserWarning
+
+from utils.fuzzy_system import SistemaBienestarLaboral
+from utils.puntuacion import puntuar_archivo, puntuar_bloque
+
+CSV = (
+    "horas_trabajo,calidad_sueno,carga_mental,satisfaccion\n"
+    "40,6,5,7\n"
+    "45,5,6,6\n"
+    "1,2,3,4,5,6,7\n"
+    "50,4,8,3\n"
+    "35,8,3,8\n"
+)
+
+
+@pytest.mark.parametrize('tamano_bloque', [2, 3, 50_000])
+def test_linea_con_campos_de_mas_se_omite_con_cualquier_bloque(tmp_path, tamano_bloque):
+    """La línea sobrante cae al inicio del segundo bloque con tamano_bloque=2"""
+    entrada, salida = tmp_path / 'entrada.csv', tmp_path / 'salida.csv'
+    entrada.write_text(CSV, encoding='utf-8')
+    with pytest.warns(ParserWarning, match='7 campos'):
+        filas, _ = puntuar_archivo(str(entrada), str(salida), tamano_bloque=tamano_bloque, trabajadores=1,
+                                   directorio_cache=str(tmp_path / 'cache'))
+
+    resultado = pd.read_csv(salida)
+    assert filas == 4
+    assert resultado['horas_trabajo'].tolist() == [40, 45, 50, 35]
+    assert resultado['error'].isna().all()
+
+
+def test_valores_no_finitos_quedan_con_error():
+    bloque = pd.DataFrame({
+        'horas_trabajo': ['40', 'inf', '-inf', '45', ''],
+        'calidad_sueno': ['6', '6', '6', 'nan', '6'],
+        'carga_mental': ['5', '5', '5', '5', '5'],
+        'satisfaccion': ['7', '7', '7', '7', '7'],
+    })
+    resultado = puntuar_bloque(bloque, SistemaBienestarLaboral(motor='compilado'))
+    assert resultado['error'].isna().tolist() == [True, False, False, False, False]
+    assert "infinito" in resultado['error'][1]
+    assert resultado['nivel_estres'][1:].isna().all()
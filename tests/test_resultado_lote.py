@@ -0,0 +1,73 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from utils.fuzzy_system import SistemaBienestarLaboral
+from utils.recomendaciones import CODIGO_SIN_DIAGNOSTICO, codigo_recomendaciones
+from utils.resultado_lote import COLUMNAS_COMPACTAS, ResultadoLote
+
+# Pico de memoria máximo por fila de diagnosticar_compacto: 14 bytes del
+# resultado más los bloques temporales repartidos entre las filas. Con menos
+# filas que en benchmarks/suite.py se reduce el bloque en la misma proporción
+PRESUPUESTO_BYTES_FILA = 64
+FILAS = 200_000
+FILAS_POR_BLOQUE = 16_384
+
+
+@pytest.fixture(scope='module')
+def sistema():
+    return SistemaBienestarLaboral(motor='tabla', directorio_tabla=None)
+
+
+def _entradas(filas):
+    generador = np.random.default_rng(0)
+    return (
+        generador.integers(0, 81, filas), generador.integers(1, 11, filas),
+        generador.integers(1, 11, filas), generador.integers(1, 11, filas),
+    )
+
+
+def test_memoria_por_fila_dentro_del_presupuesto(sistema):
+    entradas = _entradas(FILAS)
+    sistema.diagnosticar_compacto(*(valores[:10] for valores in entradas))  # Cargas perezosas fuera de la medición
+
+    tracemalloc.start()
+    try:
+        resultado = sistema.diagnosticar_compacto(*entradas, filas_por_bloque=FILAS_POR_BLOQUE)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert resultado.nbytes == FILAS * sum(np.dtype(tipo).itemsize for tipo in COLUMNAS_COMPACTAS.values())
+    assert pico / FILAS <= PRESUPUESTO_BYTES_FILA
+
+
+def test_resultado_en_disco_coincide_con_el_lote(sistema, tmp_path):
+    entradas = _entradas(1_000)
+    esperado = sistema.diagnosticar_lote(*entradas)
+    sistema.diagnosticar_compacto(*entradas, directorio=tmp_path, filas_por_bloque=300)
+
+    resultado = ResultadoLote.abrir(tmp_path)
+    assert len(resultado) == 1_000
+    np.testing.assert_array_equal(resultado.respaldo, esperado['respaldo'])
+    np.testing.assert_allclose(resultado.nivel_estres, esperado['nivel_estres'], rtol=1e-6)
+    fila = resultado[5]
+    assert fila['recomendaciones'] == sistema.recomendaciones_lote(
+        esperado['nivel_estres'][5], esperado['productividad'][5], esperado['prioridad_accion'][5]
+    )[0]
+
+
+def test_filas_sin_diagnostico_no_se_reportan_sanas(sistema):
+    resultado = sistema.diagnosticar_compacto([np.nan, 40, np.inf], [6, 6, 6], [5, 5, 5], [7, 7, 7])
+    assert resultado.codigo.tolist()[0] == resultado.codigo.tolist()[2] == CODIGO_SIN_DIAGNOSTICO
+    assert resultado.codigo[1] != CODIGO_SIN_DIAGNOSTICO
+    sin_diagnostico = resultado[0]['recomendaciones']
+    assert [r['tipo'] for r in sin_diagnostico] == ["❔ SIN DIAGNÓSTICO"]
+
+    lote = sistema.diagnosticar_lote([np.inf], 6, 5, 7)
+    assert sistema.recomendaciones_lote(
+        lote['nivel_estres'], lote['productividad'], lote['prioridad_accion']
+    ) == [sin_diagnostico]
+    assert codigo_recomendaciones(float('nan'), 50.0, 5.0) == CODIGO_SIN_DIAGNOSTICO
+    assert codigo_recomendaciones(30.0, 70.0, 3.0) == 0
@@ -0,0 +1,47 @@
+import asyncio
+import json
+
+from utils.fuzzy_system import SistemaBienestarLaboral
+from utils.servicio import ServicioDiagnostico
+
+
+async def _enviar(puerto, peticion):
+    lector, escritor = await asyncio.open_connection('127.0.0.1', puerto)
+    escritor.write(peticion)
+    await escritor.drain()
+    respuesta = await asyncio.wait_for(lector.read(), 5)
+    escritor.close()
+    return respuesta
+
+
+def _consultar(peticiones):
+    """Envía cada petición en una conexión nueva y devuelve las respuestas crudas"""
+    async def principal():
+        servicio = ServicioDiagnostico(SistemaBienestarLaboral(motor='compilado'))
+        _, puerto = await servicio.iniciar(puerto=0)
+        try:
+            return [await _enviar(puerto, peticion) for peticion in peticiones]
+        finally:
+            await servicio.detener()
+    return asyncio.run(principal())
+
+
+def test_peticiones_mal_formadas_responden_400():
+    negativo, larga = _consultar([
+        b'POST /diagnosticar HTTP/1.1\r\nContent-Length: -1\r\n\r\n',
+        # Supera el límite de línea del lector (64 KiB) pero cabe en su búfer, así el
+        # servidor lo lee entero y cierra sin reiniciar la conexión
+        b'GET /salud' + b'x' * 2**16 + b' HTTP/1.1\r\n\r\n',
+    ])
+    assert negativo.startswith(b'HTTP/1.1 400')
+    assert larga.startswith(b'HTTP/1.1 400')
+
+
+def test_diagnostico_individual():
+    cuerpo = json.dumps({'horas_trabajo': 40, 'calidad_sueno': 6, 'carga_mental': 5, 'satisfaccion': 7}).encode()
+    respuesta, = _consultar([
+        b'POST /diagnosticar HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n' % len(cuerpo) + cuerpo
+    ])
+    cabecera, _, datos = respuesta.partition(b'\r\n\r\n')
+    assert cabecera.startswith(b'HTTP/1.1 200')
+    assert json.loads(datos)['respaldo'] is False
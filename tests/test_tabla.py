@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from utils.fuzzy_system import SistemaBienestarLaboral
+
+
+@pytest.fixture(scope='module')
+def sistemas():
+    compilado = SistemaBienestarLaboral(motor='compilado')
+    tabla = SistemaBienestarLaboral(motor='tabla', directorio_tabla=None)
+    return compilado, tabla
+
+
+def test_punto_cubierto_en_celda_con_respaldo_se_evalua_exacto(sistemas):
+    compilado, tabla = sistemas
+    resultado = tabla.diagnosticar(44.5, 9, 1, 9)
+    assert 'advertencia' not in resultado
+    assert resultado['nivel_estres'] == pytest.approx(compilado.diagnosticar(44.5, 9, 1, 9)['nivel_estres'])
+
+
+def test_respaldo_del_lote_coincide_con_el_motor_compilado(sistemas):
+    compilado, tabla = sistemas
+    generador = np.random.default_rng(5)
+    entradas = [generador.uniform(minimo, maximo, 50_000) for minimo, maximo in compilado.limites]
+    esperado = compilado.diagnosticar_lote(*entradas)
+    previos = tabla.estadisticas_caminos()['total']
+    resultado = tabla.diagnosticar_lote(*entradas)
+
+    np.testing.assert_array_equal(resultado['respaldo'], esperado['respaldo'])
+    np.testing.assert_allclose(resultado['nivel_estres'][esperado['respaldo']],
+                               esperado['nivel_estres'][esperado['respaldo']])
+    assert tabla.estadisticas_caminos()['total'] - previos == 50_000
@@ -0,0 +1,81 @@
+import hashlib
+import os
+import pickle
+
+from utils.tabla_respuesta import DIRECTORIO_CACHE
+
+# Se incrementa si cambia el formato del artefacto
+VERSION_ARTEFACTO = 1
+
+# Módulos cuyo código define el sistema construido; cualquier cambio en
+# ellos invalida los artefactos guardados
+MODULOS_SISTEMA = ('fuzzy_system.py', 'configuracion.py', 'motor_compilado.py', 'cobertura.py')
+
+
+class ArtefactoSistema:
+    """Sistema ya construido guardado en disco para arranques rápidos.
+
+    Contiene lo que los motores 'compilado' y 'tabla' necesitan para
+    diagnosticar con una configuración dada: las formas de los términos, el
+    plan compilado (con los arreglos de pertenencia) y el mapa de cobertura.
+    Cargarlo evita importar skfuzzy y volver a definir las funciones de
+    pertenencia y las reglas.
+    """
+
+    def __init__(self, plan, formas, cobertura, firma):
+        self.plan = plan
+        self.formas = formas
+        self.cobertura = cobertura
+        self.firma = firma
+
+    @classmethod
+    def desde_sistema(cls, sistema):
+        firma = firma_artefacto(sistema.resolucion, sistema.centroide, sistema.firma_configuracion)
+        return cls(sistema.plan, sistema.formas, sistema.cobertura, firma)
+
+    @classmethod
+    def cargar(cls, resolucion, centroide, firma_configuracion, directorio=DIRECTORIO_CACHE):
+        """Devuelve el artefacto guardado para estas opciones, o None si no hay uno válido"""
+        firma = firma_artefacto(resolucion, centroide, firma_configuracion)
+        try:
+            with open(ruta_artefacto(directorio, firma), 'rb') as archivo:
+                datos = pickle.load(archivo)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None  # Archivo dañado o de otra versión del código: se reconstruye
+        if not isinstance(datos, dict) or datos.get('version') != VERSION_ARTEFACTO or datos.get('firma') != firma:
+            return None
+        return cls(datos['plan'], datos['formas'], datos['cobertura'], firma)
+
+    def guardar(self, directorio=DIRECTORIO_CACHE):
+        """Guarda el artefacto de forma atómica para que otros procesos no lean archivos a medias"""
+        ruta = ruta_artefacto(directorio, self.firma)
+        os.makedirs(directorio, exist_ok=True)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        datos = {
+            'version': VERSION_ARTEFACTO,
+            'firma': self.firma,
+            'plan': self.plan,
+            'formas': self.formas,
+            'cobertura': self.cobertura,
+        }
+        with open(temporal, 'wb') as archivo:
+            pickle.dump(datos, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporal, ruta)
+        return ruta
+
+
+def ruta_artefacto(directorio, firma):
+    return os.path.join(directorio, f"sistema_{firma[:16]}.pkl")
+
+
+def firma_artefacto(resolucion, centroide, firma_configuracion):
+    """Hash del código que construye el sistema, de su configuración y de las opciones que lo cambian"""
+    h = hashlib.sha256(f"v{VERSION_ARTEFACTO}".encode())
+    carpeta = os.path.dirname(os.path.abspath(__file__))
+    for nombre in MODULOS_SISTEMA:
+        with open(os.path.join(carpeta, nombre), 'rb') as archivo:
+            h.update(archivo.read())
+    h.update(f"{float(resolucion)!r}|{centroide}|{firma_configuracion}".encode())
+    return h.hexdigest()
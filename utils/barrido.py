@@ -0,0 +1,164 @@
+"""Barridos de la malla de entradas y de poblaciones grandes en varios procesos.
+
+Cada proceso del pool crea su propio SistemaBienestarLaboral una sola vez,
+igual que los de utils.puntuacion (desde el artefacto guardado, sin
+importar skfuzzy), y escribe sus filas
+directamente en arreglos de multiprocessing.shared_memory, así que los
+resultados no se serializan de vuelta al proceso principal. Cada tarea es
+un tramo contiguo de filas y escribe solo en sus posiciones: el resultado
+no depende de cuántos procesos haya ni del orden en que terminen, y
+coincide exactamente con diagnosticar_lote en un solo proceso.
+"""
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from utils import puntuacion
+from utils.configuracion import VARIABLES_ENTRADA, cargar_configuracion
+from utils.fuzzy_system import MOTORES
+from utils.tabla_respuesta import DIRECTORIO_CACHE
+
+# Salidas escritas por los trabajadores y su tipo
+SALIDAS_BARRIDO = {
+    'nivel_estres': np.float64,
+    'productividad': np.float64,
+    'prioridad_accion': np.float64,
+    'respaldo': np.bool_,
+}
+
+# Memoria compartida vista desde cada proceso trabajador; el sistema es el
+# de utils.puntuacion
+_memorias = []
+_salidas = {}
+_entradas = None
+_ejes = None
+
+
+def barrer_malla(paso=1.0, trabajadores=None, motor='compilado', configuracion=None, informar=None,
+                 filas_por_tarea=16_384, directorio_cache=DIRECTORIO_CACHE):
+    """Diagnostica la malla completa de las cuatro entradas con separación `paso`.
+
+    `paso` es un número o un diccionario por entrada; cada eje va del mínimo
+    al máximo del universo de su variable (incluidos) con puntos equiespaciados
+    a lo sumo `paso`, como los ejes de TablaRespuesta. Los trabajadores calculan las
+    entradas de sus filas a partir del índice, así que no se envían.
+    Devuelve (ejes, resultado) con arreglos de forma (len(eje) for eje in ejes).
+    """
+    configuracion_leida, _ = cargar_configuracion(configuracion)
+    pasos = paso if isinstance(paso, dict) else dict.fromkeys(VARIABLES_ENTRADA, paso)
+    ejes = []
+    for nombre in VARIABLES_ENTRADA:
+        minimo, maximo = configuracion_leida['variables'][nombre]['universo']
+        if pasos[nombre] <= 0:
+            raise ValueError(f"El paso de '{nombre}' debe ser positivo")
+        puntos = int(np.ceil(round((maximo - minimo) / pasos[nombre], 9))) + 1
+        ejes.append(np.linspace(minimo, maximo, puntos))
+
+    forma = tuple(len(eje) for eje in ejes)
+    resultado = _barrer(int(np.prod(forma)), trabajadores, motor, configuracion, informar, filas_por_tarea,
+                        directorio_cache, ejes=ejes)
+    return ejes, {nombre: valores.reshape(forma) for nombre, valores in resultado.items()}
+
+
+def barrer_poblacion(horas, sueno, carga, satisf, trabajadores=None, motor='compilado', configuracion=None,
+                     informar=None, filas_por_tarea=16_384, directorio_cache=DIRECTORIO_CACHE):
+    """Diagnostica una población simulada repartiendo sus filas entre procesos.
+
+    Las entradas se copian una vez a memoria compartida (float64) y cada
+    trabajador lee su tramo sin copiarlo. Devuelve el mismo diccionario que
+    diagnosticar_lote, con la forma de las entradas.
+    """
+    horas, sueno, carga, satisf = np.broadcast_arrays(*(np.asarray(v) for v in (horas, sueno, carga, satisf)))
+    forma = horas.shape
+    resultado = _barrer(horas.size, trabajadores, motor, configuracion, informar, filas_por_tarea,
+                        directorio_cache, entradas=(horas, sueno, carga, satisf))
+    return {nombre: valores.reshape(forma) for nombre, valores in resultado.items()}
+
+
+def _barrer(filas, trabajadores, motor, configuracion, informar, filas_por_tarea, directorio_cache, ejes=None,
+            entradas=None):
+    """Reparte `filas` en tramos entre el pool y devuelve las salidas copiadas de la memoria compartida.
+
+    informar(filas_hechas, filas, segundos) se llama en el proceso principal
+    cada vez que termina un tramo. Los trabajadores usan `directorio_cache`
+    como en puntuar_archivo.
+    """
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconocido: {motor}. Opciones: {', '.join(MOTORES)}")
+    if filas_por_tarea < 1:
+        raise ValueError("filas_por_tarea debe ser al menos 1")
+    trabajadores = trabajadores or os.cpu_count() or 1
+    memorias = []
+    try:
+        salidas = {}
+        for nombre, tipo in SALIDAS_BARRIDO.items():
+            memoria, salidas[nombre] = _compartido((filas,), tipo)
+            memorias.append(memoria)
+        compartidas = {
+            nombre: (memoria.name, tipo, (filas,)) for memoria, (nombre, tipo) in zip(memorias, SALIDAS_BARRIDO.items())
+        }
+        if entradas is not None:
+            memoria, matriz = _compartido((len(entradas), filas), np.float64)
+            memorias.append(memoria)
+            for fila, valores in zip(matriz, entradas):
+                fila[:] = np.ravel(valores)
+            compartidas['entradas'] = (memoria.name, np.float64, matriz.shape)
+
+        tramos = [(inicio, min(inicio + filas_por_tarea, filas)) for inicio in range(0, filas, filas_por_tarea)]
+        hechas = 0
+        inicio = time.perf_counter()
+        with ProcessPoolExecutor(trabajadores, initializer=_iniciar_trabajador,
+                                 initargs=(motor, configuracion, directorio_cache, compartidas, ejes)) as pool:
+            pendientes = {pool.submit(_barrer_tramo, *tramo) for tramo in tramos}
+            while pendientes:
+                terminadas, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+                for tarea in terminadas:
+                    hechas += tarea.result()
+                if informar:
+                    informar(hechas, filas, time.perf_counter() - inicio)
+
+        return {nombre: valores.copy() for nombre, valores in salidas.items()}
+    finally:
+        salidas = matriz = fila = None  # Soltar las vistas antes de cerrar los bloques
+        for memoria in memorias:
+            memoria.close()
+            memoria.unlink()
+
+
+def _compartido(forma, tipo):
+    """Bloque nuevo de memoria compartida y un arreglo sobre él"""
+    tamano = max(int(np.prod(forma)) * np.dtype(tipo).itemsize, 1)
+    memoria = shared_memory.SharedMemory(create=True, size=tamano)
+    return memoria, np.ndarray(forma, dtype=tipo, buffer=memoria.buf)
+
+
+def _iniciar_trabajador(motor, configuracion, directorio_cache, compartidas, ejes):
+    global _entradas, _ejes
+    puntuacion._iniciar_trabajador(motor, configuracion, directorio_cache)
+    _ejes = ejes
+    for nombre, (nombre_bloque, tipo, forma) in compartidas.items():
+        # Los procesos del pool comparten el resource_tracker del principal,
+        # que es quien crea y elimina los bloques
+        memoria = shared_memory.SharedMemory(name=nombre_bloque)
+        _memorias.append(memoria)
+        arreglo = np.ndarray(forma, dtype=tipo, buffer=memoria.buf)
+        if nombre == 'entradas':
+            _entradas = arreglo
+        else:
+            _salidas[nombre] = arreglo
+
+
+def _barrer_tramo(inicio, fin):
+    """Diagnostica las filas [inicio, fin) y las escribe en la memoria compartida"""
+    if _ejes is not None:
+        indices = np.unravel_index(np.arange(inicio, fin), tuple(len(eje) for eje in _ejes))
+        entradas = [eje[indice] for eje, indice in zip(_ejes, indices)]
+    else:
+        entradas = _entradas[:, inicio:fin]
+    resultado = puntuacion._sistema.diagnosticar_lote(*entradas)
+    for nombre, valores in _salidas.items():
+        valores[inicio:fin] = resultado[nombre]
+    return fin - inicio
@@ -0,0 +1,81 @@
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+
+
+class CacheDiagnosticos:
+    """Caché LRU acotada de diagnósticos, segura entre hilos.
+
+    Las claves son las entradas ya limitadas a su rango; con `cuantizacion`
+    los valores se redondean a múltiplos de ese paso antes de formar la
+    clave. Los resultados se guardan congelados (mappingproxy y tuplas) para
+    que quien los recibe no pueda alterar la entrada compartida.
+    """
+
+    def __init__(self, tamano_maximo=1024, cuantizacion=None):
+        if tamano_maximo < 1:
+            raise ValueError("tamano_maximo debe ser al menos 1")
+        if cuantizacion is not None and cuantizacion <= 0:
+            raise ValueError("cuantizacion debe ser positiva")
+        self.tamano_maximo = tamano_maximo
+        self.cuantizacion = cuantizacion
+        self._entradas = OrderedDict()
+        self._candado = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def clave(self, *valores):
+        """Clave de caché para unas entradas ya limitadas"""
+        if self.cuantizacion is None:
+            return tuple(float(v) for v in valores)
+        return tuple(round(v / self.cuantizacion) * self.cuantizacion for v in valores)
+
+    def obtener_o_calcular(self, clave, calcular):
+        """Devuelve el resultado guardado para `clave` o lo calcula y lo guarda"""
+        with self._candado:
+            resultado = self._entradas.get(clave)
+            if resultado is not None:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return resultado
+            self.fallos += 1
+
+        # Calcular fuera del candado para no serializar los diagnósticos
+        resultado = congelar(calcular())
+
+        with self._candado:
+            self._entradas[clave] = resultado
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.tamano_maximo:
+                self._entradas.popitem(last=False)
+                self.desalojos += 1
+        return resultado
+
+    def limpiar(self):
+        """Vacía la caché y reinicia los contadores"""
+        with self._candado:
+            self._entradas.clear()
+            self.aciertos = self.fallos = self.desalojos = 0
+
+    def estadisticas(self):
+        """Contadores de uso para dimensionar la caché"""
+        with self._candado:
+            consultas = self.aciertos + self.fallos
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'desalojos': self.desalojos,
+                'tamano': len(self._entradas),
+                'tamano_maximo': self.tamano_maximo,
+                'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+            }
+
+
+def congelar(resultado):
+    """Copia inmutable de un diagnóstico (diccionario con lista de recomendaciones)"""
+    congelado = dict(resultado)
+    congelado['recomendaciones'] = tuple(
+        MappingProxyType(dict(recomendacion)) for recomendacion in resultado['recomendaciones']
+    )
+    return MappingProxyType(congelado)
@@ -0,0 +1,96 @@
+from bisect import bisect_left
+
+import numpy as np
+
+
+class MapaCobertura:
+    """Mapa de las regiones de entrada donde alguna salida queda sin activar.
+
+    Que una pertenencia sea cero, uno o intermedia solo cambia en los
+    vértices de las funciones de pertenencia, así que cada eje se divide en
+    celdas (cada vértice y cada intervalo abierto entre vértices) y basta con
+    evaluar un punto representativo por celda. Como el plan interpola las
+    funciones muestreadas en el universo, un vértice que cae entre dos
+    muestras mueve el cambio a esas muestras; por eso también se agregan
+    como vértices. El resultado vale para cualquier entrada real, no solo
+    para la malla entera, y se consulta en tiempo constante.
+    """
+
+    def __init__(self, etiquetas, vertices, cubierta):
+        self.etiquetas = etiquetas
+        self.vertices = vertices
+        self.cubierta = cubierta
+
+    @classmethod
+    def desde_plan(cls, plan, formas=None):
+        """Construye el mapa evaluando las reglas en un representante por celda"""
+        formas = formas or {}
+        etiquetas, vertices, representantes = [], [], []
+        for etiqueta, universo, terminos in plan.entradas:
+            minimo, maximo = float(universo[0]), float(universo[-1])
+            puntos = {minimo, maximo}
+            muestras = np.asarray(universo, dtype=float)
+            for clave, forma in formas.items():
+                if clave[0] == etiqueta:
+                    for p in forma:
+                        if minimo <= p <= maximo:
+                            # Muestras que rodean al vértice: ahí cambia la función interpolada
+                            i = np.searchsorted(muestras, p)
+                            puntos.update(float(x) for x in muestras[max(i - 1, 0):i + 1])
+                            puntos.add(p)
+            if not any(clave[0] == etiqueta for clave in formas):
+                # Sin formas conocidas: los quiebres posibles son las muestras
+                puntos.update(float(x) for x in universo)
+            puntos = sorted(puntos)
+            medios = [(a + b) / 2 for a, b in zip(puntos, puntos[1:])]
+            celdas = [None] * (2 * len(puntos) - 1)
+            celdas[0::2], celdas[1::2] = puntos, medios
+            etiquetas.append(etiqueta)
+            vertices.append(puntos)
+            representantes.append(np.array(celdas))
+
+        malla = np.meshgrid(*representantes, indexing='ij')
+        activas = plan.activaciones({e: m.ravel() for e, m in zip(etiquetas, malla)})
+        cubierta = np.logical_and.reduce(list(activas.values())).reshape(malla[0].shape)
+        return cls(etiquetas, vertices, cubierta)
+
+    def _celda(self, eje, valor):
+        puntos = self.vertices[eje]
+        i = bisect_left(puntos, valor)
+        if i < len(puntos) and puntos[i] == valor:
+            return 2 * i
+        return min(max(2 * i - 1, 0), 2 * len(puntos) - 2)
+
+    def cubre(self, *valores):
+        """True si las entradas (ya limitadas) activan todas las salidas"""
+        return bool(self.cubierta[tuple(self._celda(d, v) for d, v in enumerate(valores))])
+
+    def cubre_lote(self, entradas):
+        """Versión vectorizada de cubre para un diccionario de arreglos"""
+        indices = []
+        for d, etiqueta in enumerate(self.etiquetas):
+            puntos = np.asarray(self.vertices[d])
+            valores = entradas[etiqueta]
+            i = np.searchsorted(puntos, valores)
+            exacto = (i < len(puntos)) & (puntos[np.minimum(i, len(puntos) - 1)] == valores)
+            indices.append(np.where(exacto, 2 * i, np.clip(2 * i - 1, 0, 2 * len(puntos) - 2)))
+        return self.cubierta[tuple(indices)]
+
+    def regiones_descubiertas(self):
+        """Lista las celdas sin cobertura como rangos legibles por variable"""
+        regiones = []
+        for indice in zip(*np.nonzero(~self.cubierta)):
+            region = {}
+            for etiqueta, puntos, celda in zip(self.etiquetas, self.vertices, indice):
+                if celda % 2 == 0:
+                    region[etiqueta] = (puntos[celda // 2], puntos[celda // 2])
+                else:
+                    region[etiqueta] = (puntos[celda // 2], puntos[celda // 2 + 1])
+            regiones.append(region)
+        return regiones
+
+    def fraccion_descubierta(self, universos):
+        """Fracción de los puntos de la malla dada (un eje por entrada) sin cobertura"""
+        malla = np.meshgrid(*universos, indexing='ij')
+        cubiertas = self.cubre_lote({e: m.ravel().astype(float) for e, m in zip(self.etiquetas, malla)})
+        return 1. - cubiertas.mean()
@@ -0,0 +1,84 @@
+"""Diagnóstico y resumen de cohortes (equipos u organizaciones completas).
+
+El archivo subido se puntúa entero con diagnosticar_lote y se reduce a
+agregados pequeños (histograma de estrés, conteo por banda de prioridad,
+lista de mayor riesgo), de modo que quien lo muestre no necesita recibir
+una fila por empleado.
+"""
+import hashlib
+import io
+
+import numpy as np
+import pandas as pd
+
+from utils.fuzzy_system import COLUMNAS_ENTRADA, UMBRAL_ESTRES_ALTO
+from utils.puntuacion import puntuar_bloque
+
+# Bandas de prioridad_accion con los mismos cortes que las tarjetas de app.py:
+# hasta 5 baja, hasta 7 media y por encima alta
+BANDAS_PRIORIDAD = ('Baja', 'Media', 'Alta')
+CORTES_PRIORIDAD = (5, 7)
+
+# Bordes del histograma de nivel_estres
+BORDES_ESTRES = np.linspace(0, 100, 21)
+
+# Error de las filas con entradas válidas pero alguna salida no finita
+MENSAJE_SIN_DIAGNOSTICO = "El diagnóstico no produjo un valor finito"
+
+
+def firma_contenido(contenido):
+    """Hash SHA-256 del archivo subido; identifica la cohorte para la caché"""
+    return hashlib.sha256(contenido).hexdigest()
+
+
+def leer_cohorte(contenido, formato='csv'):
+    """DataFrame con el contenido de un archivo subido; `formato` es 'csv' o 'parquet'"""
+    if formato == 'parquet':
+        datos = pd.read_parquet(io.BytesIO(contenido))
+    else:
+        datos = pd.read_csv(io.BytesIO(contenido))
+    faltantes = [c for c in COLUMNAS_ENTRADA if c not in datos]
+    if faltantes:
+        raise ValueError(f"Faltan columnas en el archivo: {', '.join(faltantes)}")
+    return datos
+
+
+def resumir_cohorte(sistema, datos, mayor_riesgo=20):
+    """Puntúa todas las filas de `datos` y devuelve solo los agregados.
+
+    Las filas con entradas faltantes, no numéricas o infinitas (o con alguna
+    salida no finita) no entran en los agregados; se cuentan en 'invalidas'
+    y 'errores'. 'mayor_riesgo' son las filas de mayor prioridad_accion (y
+    después mayor estrés) con sus columnas originales.
+    """
+    resultados = puntuar_bloque(datos, sistema)
+    # Una salida no finita no se puede agregar aunque la fila no tenga mensaje
+    # de error: NaN volvería NaN las medias y caería en la última banda
+    salidas = resultados[['nivel_estres', 'productividad', 'prioridad_accion']].to_numpy(dtype=float)
+    finitas = np.isfinite(salidas).all(axis=1)
+    errores = resultados['error'].where(finitas | resultados['error'].notna(), MENSAJE_SIN_DIAGNOSTICO)
+    validas = errores.isna().to_numpy()
+    estres, productividad, prioridad = salidas[validas].T
+
+    conteos, _ = np.histogram(estres, bins=BORDES_ESTRES)
+    bandas = np.bincount(np.searchsorted(CORTES_PRIORIDAD, prioridad), minlength=len(BANDAS_PRIORIDAD))
+    riesgo = (
+        resultados[validas]
+        .nlargest(mayor_riesgo, ['prioridad_accion', 'nivel_estres'])
+        .drop(columns=['respaldo', 'error'])
+        .reset_index(drop=True)
+    )
+
+    hay_validas = bool(estres.size)
+    return {
+        'filas': len(resultados),
+        'invalidas': int((~validas).sum()),
+        'errores': errores[~validas].value_counts().to_dict(),
+        'estres_medio': float(estres.mean()) if hay_validas else float('nan'),
+        'estres_mediano': float(np.median(estres)) if hay_validas else float('nan'),
+        'proporcion_estres_alto': float((estres > UMBRAL_ESTRES_ALTO).mean()) if hay_validas else float('nan'),
+        'productividad_media': float(productividad.mean()) if hay_validas else float('nan'),
+        'histograma_estres': (BORDES_ESTRES, conteos),
+        'bandas_prioridad': dict(zip(BANDAS_PRIORIDAD, bandas.tolist())),
+        'mayor_riesgo': riesgo,
+    }
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import re
+
+# Configuración con las variables, términos y reglas originales del sistema
+CONFIGURACION_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'configuracion_base.json')
+
+# Variables que espera SistemaBienestarLaboral, en el orden de sus argumentos
+VARIABLES_ENTRADA = ('horas_trabajo', 'calidad_sueno', 'carga_mental', 'satisfaccion')
+VARIABLES_SALIDA = ('nivel_estres', 'productividad', 'prioridad_accion')
+
+# Formas de término soportadas y cuántos puntos lleva cada una
+FORMAS = {'trimf': 3, 'trapmf': 4}
+
+_TOKEN = re.compile(r"\s*(?:(?P<termino>(?P<variable>\w+)\s*\[\s*(?P<etiqueta>\w+)\s*\])|(?P<operador>[&|~()]))")
+
+
+class ErrorConfiguracion(ValueError):
+    """La configuración no tiene la estructura esperada"""
+
+
+def cargar_configuracion(origen=None):
+    """Lee y valida una configuración JSON o YAML.
+
+    `origen` puede ser una ruta (.json, .yaml o .yml), un diccionario ya
+    cargado o None para la configuración base. Devuelve (configuración,
+    firma), donde la firma es el hash SHA-256 de su contenido normalizado.
+    """
+    if origen is None:
+        origen = CONFIGURACION_BASE
+    if isinstance(origen, dict):
+        configuracion = origen
+    else:
+        with open(origen, encoding='utf-8') as archivo:
+            if origen.endswith(('.yaml', '.yml')):
+                try:
+                    import yaml
+                except ImportError:
+                    raise ImportError("Leer configuraciones YAML requiere PyYAML (pip install pyyaml)") from None
+                configuracion = yaml.safe_load(archivo)
+            else:
+                configuracion = json.load(archivo)
+    validar_configuracion(configuracion)
+    return configuracion, firma_configuracion(configuracion)
+
+
+def firma_configuracion(configuracion):
+    """Hash del contenido; no depende del formato ni del orden de las claves"""
+    texto = json.dumps(configuracion, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(texto.encode()).hexdigest()
+
+
+def validar_configuracion(configuracion):
+    """Comprueba variables, términos y reglas; lanza ErrorConfiguracion con el primer problema"""
+    if not isinstance(configuracion, dict):
+        raise ErrorConfiguracion("La configuración debe ser un objeto con 'variables' y 'reglas'")
+    variables = configuracion.get('variables')
+    if not isinstance(variables, dict):
+        raise ErrorConfiguracion("Falta el objeto 'variables'")
+
+    esperadas = {**{v: 'entrada' for v in VARIABLES_ENTRADA}, **{v: 'salida' for v in VARIABLES_SALIDA}}
+    if set(variables) != set(esperadas):
+        raise ErrorConfiguracion(f"Las variables deben ser exactamente: {', '.join(esperadas)}")
+
+    for nombre, variable in variables.items():
+        if not isinstance(variable, dict):
+            raise ErrorConfiguracion(f"'{nombre}' debe ser un objeto")
+        if variable.get('tipo') != esperadas[nombre]:
+            raise ErrorConfiguracion(f"'{nombre}' debe ser de tipo '{esperadas[nombre]}'")
+        universo = variable.get('universo')
+        if not (isinstance(universo, list) and len(universo) == 2 and universo[0] < universo[1]):
+            raise ErrorConfiguracion(f"'{nombre}.universo' debe ser [mínimo, máximo] con mínimo < máximo")
+        if variable.get('paso', 1) <= 0:
+            raise ErrorConfiguracion(f"'{nombre}.paso' debe ser positivo")
+        terminos = variable.get('terminos')
+        if not isinstance(terminos, dict) or not terminos:
+            raise ErrorConfiguracion(f"'{nombre}' necesita al menos un término")
+        for etiqueta, termino in terminos.items():
+            forma, puntos = termino.get('forma'), termino.get('puntos')
+            if forma not in FORMAS:
+                raise ErrorConfiguracion(f"'{nombre}[{etiqueta}]': forma desconocida {forma!r}. "
+                                         f"Opciones: {', '.join(FORMAS)}")
+            if not isinstance(puntos, list) or len(puntos) != FORMAS[forma]:
+                raise ErrorConfiguracion(f"'{nombre}[{etiqueta}]': {forma} necesita {FORMAS[forma]} puntos")
+            if list(puntos) != sorted(puntos):
+                raise ErrorConfiguracion(f"'{nombre}[{etiqueta}]': los puntos deben estar ordenados")
+
+    reglas = configuracion.get('reglas')
+    if not isinstance(reglas, list) or not reglas:
+        raise ErrorConfiguracion("Falta la lista 'reglas'")
+    for i, regla in enumerate(reglas, 1):
+        try:
+            _comprobar_terminos(analizar_expresion(regla['si']), variables)
+            for consecuente in consecuentes_de(regla):
+                if consecuente[1] not in VARIABLES_SALIDA:
+                    raise ErrorConfiguracion(f"'{consecuente[1]}' no es una variable de salida")
+                _comprobar_terminos(consecuente, variables)
+        except (KeyError, TypeError, AttributeError):
+            raise ErrorConfiguracion(f"Regla {i}: necesita 'si' y 'entonces'") from None
+        except ErrorConfiguracion as error:
+            raise ErrorConfiguracion(f"Regla {i}: {error}") from None
+
+
+def consecuentes_de(regla):
+    """Términos del 'entonces' de una regla (texto o lista de textos)"""
+    entonces = regla['entonces']
+    if isinstance(entonces, str):
+        entonces = [entonces]
+    consecuentes = [analizar_expresion(texto) for texto in entonces]
+    for consecuente in consecuentes:
+        if consecuente[0] != 'termino':
+            raise ErrorConfiguracion("'entonces' solo admite términos sueltos, como nivel_estres[alto]")
+    return consecuentes
+
+
+def analizar_expresion(texto):
+    """Convierte 'a[x] & (b[y] | ~c[z])' en un árbol de tuplas.
+
+    Nodos: ('termino', variable, etiqueta), ('no', a), ('y', a, b), ('o', a, b).
+    Misma precedencia y asociatividad que los operadores de skfuzzy en
+    Python: ~ antes que &, & antes que |, de izquierda a derecha.
+    """
+    tokens, posicion = [], 0
+    texto = texto.rstrip()
+    while posicion < len(texto):
+        encontrado = _TOKEN.match(texto, posicion)
+        if not encontrado:
+            raise ErrorConfiguracion(f"Expresión inválida cerca de {texto[posicion:posicion + 20]!r}")
+        if encontrado['termino']:
+            tokens.append(('termino', encontrado['variable'], encontrado['etiqueta']))
+        else:
+            tokens.append(encontrado['operador'])
+        posicion = encontrado.end()
+
+    def siguiente():
+        return tokens[0] if tokens else None
+
+    def o():
+        nodo = y()
+        while siguiente() == '|':
+            tokens.pop(0)
+            nodo = ('o', nodo, y())
+        return nodo
+
+    def y():
+        nodo = no()
+        while siguiente() == '&':
+            tokens.pop(0)
+            nodo = ('y', nodo, no())
+        return nodo
+
+    def no():
+        token = tokens.pop(0) if tokens else None
+        if token == '~':
+            return ('no', no())
+        if token == '(':
+            nodo = o()
+            if siguiente() != ')':
+                raise ErrorConfiguracion(f"Falta ')' en {texto!r}")
+            tokens.pop(0)
+            return nodo
+        if isinstance(token, tuple):
+            return token
+        raise ErrorConfiguracion(f"Se esperaba un término en {texto!r}")
+
+    arbol = o()
+    if tokens:
+        sobrante = f"{tokens[0][1]}[{tokens[0][2]}]" if isinstance(tokens[0], tuple) else tokens[0]
+        raise ErrorConfiguracion(f"Sobra '{sobrante}' en {texto!r}")
+    return arbol
+
+
+def _comprobar_terminos(nodo, variables):
+    if nodo[0] == 'termino':
+        _, variable, etiqueta = nodo
+        if variable not in variables:
+            raise ErrorConfiguracion(f"Variable desconocida: {variable}")
+        if etiqueta not in variables[variable]['terminos']:
+            raise ErrorConfiguracion(f"Término desconocido: {variable}[{etiqueta}]")
+    else:
+        for hijo in nodo[1:]:
+            _comprobar_terminos(hijo, variables)
@@ -1,23 +1,164 @@
+import copy
+import functools
+import queue
+import threading
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
 import numpy as np
-import skfuzzy as fuzz
-from skfuzzy import control as ctrl
+from utils.artefacto_sistema import ArtefactoSistema
+from utils.cache_diagnosticos import CacheDiagnosticos
+from utils.cobertura import MapaCobertura
+from utils.configuracion import (
+    VARIABLES_ENTRADA, VARIABLES_SALIDA, analizar_expresion, cargar_configuracion, consecuentes_de
+)
+from utils.motor_compilado import PlanCompilado
+from utils.optimizador import buscar_intervenciones
+from utils.recomendaciones import codigo_recomendaciones, materializar
+from utils.tabla_respuesta import DIRECTORIO_CACHE, TablaRespuesta
+
+# skfuzzy (que arrastra scipy y matplotlib) se importa dentro de los métodos
+# que construyen el sistema; cargar un ArtefactoSistema no lo necesita
+
+# Diferencia máxima esperada entre diagnosticar_lote y diagnosticar. Ambos
+# caminos evalúan las mismas operaciones; solo cambia el orden de las sumas
+# de punto flotante en el centroide.
+TOLERANCIA_LOTE = 1e-9
+
+# Límite de elementos de los arreglos intermedios de cada bloque de
+# diagnosticar_lote (unos 16 MB en float64)
+ELEMENTOS_POR_BLOQUE = 2_000_000
+
+# Columnas esperadas cuando diagnosticar_lote recibe un DataFrame
+COLUMNAS_ENTRADA = VARIABLES_ENTRADA
+
+# Motores de evaluación disponibles para diagnosticar
+MOTORES = ('skfuzzy', 'compilado', 'tabla')
+
+# Caminos que puede seguir un diagnóstico (ver estadisticas_caminos)
+CAMINOS = ('difuso', 'respaldo_directo', 'respaldo_error')
+
+# Ruido por defecto de diagnosticar_incierto: ±1 en las valoraciones
+# subjetivas de 1 a 10; las horas de trabajo se consideran exactas
+RUIDO_SUBJETIVO = {'calidad_sueno': 1.0, 'carga_mental': 1.0, 'satisfaccion': 1.0}
+
+# Nivel de estrés a partir del cual las recomendaciones son críticas
+UMBRAL_ESTRES_ALTO = 70
+
+# Mensaje cuando ninguna regla activa alguna de las salidas
+MENSAJE_SIN_ACTIVACION = "Ninguna regla activa alguna salida para estas entradas."
+
+# Context manager vacío que se usa cuando la instrumentación está desactivada
+_SIN_MEDICION = nullcontext()
+
+def _medido(etapa):
+    """Mide el método bajo `etapa` solo si el sistema tiene instrumentación"""
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def envoltura(self, *args, **kwargs):
+            if self.instrumentacion is None:
+                return metodo(self, *args, **kwargs)
+            with self._medir(etapa):
+                return metodo(self, *args, **kwargs)
+        return envoltura
+    return decorador
 
 class SistemaBienestarLaboral:
-    def __init__(self):
-        self._configurar_sistema()
+    def __init__(self, motor='skfuzzy', paso_tabla=1.0, directorio_tabla=DIRECTORIO_CACHE, tamano_pool=8,
+                 resolucion=1.0, centroide='muestreado', tamano_cache=0, cuantizacion_cache=None,
+                 instrumentacion=None, directorio_artefacto=None, configuracion=None):
+        """Crea el sistema.
+
+        configuracion es la ruta de un archivo JSON/YAML (o un diccionario)
+        con las variables, términos y reglas; por defecto se usa
+        CONFIGURACION_BASE. Para cambiarla sin reiniciar ver SistemaRecargable.
+
+        motor='compilado' evalúa las reglas con un plan NumPy precompilado en
+        lugar de recorrer el grafo de skfuzzy en cada llamada.
+        motor='tabla' precalcula (o carga del disco) la superficie de respuesta
+        sobre una malla de paso `paso_tabla` y responde por interpolación.
+        Con directorio_tabla=None la tabla no se guarda en disco. En los nodos
+        de la malla coincide con 'compilado' (salvo el redondeo a float32); entre
+        nodos la interpolación multilineal no sigue los quiebres de las
+        funciones de pertenencia. Con la configuración base y paso_tabla=1,
+        sobre entradas decimales uniformes el error llega a unos 15 puntos en
+        nivel_estres, 21 en productividad y 1,4 en prioridad_accion (99 % de
+        las filas bajo 9, 9 y 0,4), y alrededor del 5 % de las filas cambia de
+        recomendaciones; con paso_tabla=0.5 baja a 11, 19 y 1,3. Para entradas
+        decimales conviene el motor 'compilado'. Los puntos cubiertos por las
+        reglas en celdas con algún vértice de respaldo se evalúan exactos.
+
+        tamano_pool limita cuántos simuladores independientes se crean para
+        atender llamadas concurrentes a diagnosticar.
+
+        resolucion es el paso de los universos de salida usados por el
+        centroide muestreado. centroide='analitico' integra las formas exactas
+        de los términos (independiente de resolucion); no está disponible con
+        el motor skfuzzy.
+
+        tamano_cache > 0 activa una caché LRU de diagnósticos de ese tamaño;
+        cuantizacion_cache redondea las entradas a ese paso antes de buscarlas
+        (útil con entradas decimales).
+
+        instrumentacion recibe una Instrumentacion para medir cada etapa del
+        diagnóstico; sin ella no se toman tiempos.
+
+        Con directorio_artefacto los motores 'compilado' y 'tabla' cargan el
+        sistema ya construido desde ese directorio (o lo construyen y lo
+        guardan ahí la primera vez), sin importar skfuzzy. El motor skfuzzy
+        siempre construye el grafo completo.
+        """
+        if motor not in MOTORES:
+            raise ValueError(f"Motor desconocido: {motor}. Opciones: {', '.join(MOTORES)}")
+        if tamano_pool < 1:
+            raise ValueError("tamano_pool debe ser al menos 1")
+        if resolucion <= 0:
+            raise ValueError("resolucion debe ser positiva")
+        if centroide == 'analitico' and motor == 'skfuzzy':
+            raise ValueError("centroide='analitico' requiere motor 'compilado' o 'tabla'")
+        self.motor = motor
+        self.tabla = None
+        self.directorio_tabla = directorio_tabla
+        self._tabla_entera = None
+        self._candado_tabla = threading.Lock()
+        self.tamano_pool = tamano_pool
+        self.resolucion = resolucion
+        self.centroide = centroide
+        self.instrumentacion = instrumentacion
+        self.cache = CacheDiagnosticos(tamano_cache, cuantizacion_cache) if tamano_cache else None
+        self.configuracion, self.firma_configuracion = cargar_configuracion(configuracion)
+        artefacto = None
+        if directorio_artefacto and motor != 'skfuzzy':
+            artefacto = ArtefactoSistema.cargar(resolucion, centroide, self.firma_configuracion, directorio_artefacto)
+        if artefacto is not None:
+            self._restaurar_sistema(artefacto)
+        else:
+            self._configurar_sistema()
+            if directorio_artefacto and motor != 'skfuzzy':
+                ArtefactoSistema.desde_sistema(self).guardar(directorio_artefacto)
+        # Rango de cada entrada; los valores fuera de él se limitan
+        self.limites = tuple((float(universo[0]), float(universo[-1])) for _, universo, _ in self.plan.entradas)
+        self._configurar_pool()
+        if motor == 'tabla':
+            with self._sin_contar():
+                self.tabla = TablaRespuesta.cargar_o_construir(self, paso_tabla, directorio_tabla)
     
     def _configurar_sistema(self):
         """Configura el sistema de lógica difusa completo"""
-        # Definir variables de entrada (Antecedentes)
-        self.horas_trabajo = ctrl.Antecedent(np.arange(0, 81, 1), 'horas_trabajo')
-        self.calidad_sueno = ctrl.Antecedent(np.arange(1, 11, 1), 'calidad_sueno')
-        self.carga_mental = ctrl.Antecedent(np.arange(1, 11, 1), 'carga_mental')
-        self.satisfaccion = ctrl.Antecedent(np.arange(1, 11, 1), 'satisfaccion')
+        from skfuzzy import control as ctrl
         
-        # Definir variables de salida (Consecuentes)
-        self.nivel_estres = ctrl.Consequent(np.arange(0, 101, 1), 'nivel_estres')
-        self.productividad = ctrl.Consequent(np.arange(0, 101, 1), 'productividad')
-        self.prioridad_accion = ctrl.Consequent(np.arange(1, 11, 1), 'prioridad_accion')
+        # Definir variables de entrada (Antecedentes) y de salida (Consecuentes);
+        # cada una queda también como atributo, p. ej. self.horas_trabajo
+        self.variables = {}
+        for nombre in VARIABLES_ENTRADA + VARIABLES_SALIDA:
+            definicion = self.configuracion['variables'][nombre]
+            minimo, maximo = definicion['universo']
+            if nombre in VARIABLES_ENTRADA:
+                variable = ctrl.Antecedent(self._universo(minimo, maximo, definicion.get('paso', 1)), nombre)
+            else:
+                variable = ctrl.Consequent(self._universo(minimo, maximo, self.resolucion), nombre)
+            self.variables[nombre] = variable
+            setattr(self, nombre, variable)
         
         # Configurar funciones de pertenencia
         self._configurar_funciones_pertenencia()
@@ -28,141 +169,532 @@ class SistemaBienestarLaboral:
         # Crear sistema de control
         self.sistema_control = ctrl.ControlSystem(self.reglas)
         self.simulador = ctrl.ControlSystemSimulation(self.sistema_control)
-    
-    def _configurar_funciones_pertenencia(self):
-        """Configura las funciones de pertenencia para todas las variables"""
-        # Horas de trabajo (0-80) - CORREGIDO
-        self.horas_trabajo['bajas'] = fuzz.trapmf(self.horas_trabajo.universe, [0, 0, 30, 45])
-        self.horas_trabajo['normales'] = fuzz.trapmf(self.horas_trabajo.universe, [30, 40, 50, 60])
-        self.horas_trabajo['altas'] = fuzz.trapmf(self.horas_trabajo.universe, [50, 65, 80, 80])
-        
-        # Calidad de sueño (1-10) - CORREGIDO para todo el rango
-        self.calidad_sueno['mala'] = fuzz.trapmf(self.calidad_sueno.universe, [1, 1, 3, 5])
-        self.calidad_sueno['regular'] = fuzz.trapmf(self.calidad_sueno.universe, [3, 4, 6, 7])
-        self.calidad_sueno['buena'] = fuzz.trapmf(self.calidad_sueno.universe, [5, 7, 10, 10])
-        
-        # Carga mental (1-10) - CORREGIDO para todo el rango
-        self.carga_mental['leve'] = fuzz.trapmf(self.carga_mental.universe, [1, 1, 3, 5])
-        self.carga_mental['moderada'] = fuzz.trapmf(self.carga_mental.universe, [3, 4, 6, 7])
-        self.carga_mental['intensa'] = fuzz.trapmf(self.carga_mental.universe, [5, 7, 10, 10])
-        
-        # Satisfacción laboral (1-10) - CORREGIDO para todo el rango
-        self.satisfaccion['baja'] = fuzz.trapmf(self.satisfaccion.universe, [1, 1, 3, 5])
-        self.satisfaccion['media'] = fuzz.trapmf(self.satisfaccion.universe, [3, 4, 6, 7])
-        self.satisfaccion['alta'] = fuzz.trapmf(self.satisfaccion.universe, [5, 7, 10, 10])
         
-        # Nivel de estrés (0-100)
-        self.nivel_estres['bajo'] = fuzz.trimf(self.nivel_estres.universe, [0, 0, 40])
-        self.nivel_estres['moderado'] = fuzz.trimf(self.nivel_estres.universe, [20, 50, 80])
-        self.nivel_estres['alto'] = fuzz.trimf(self.nivel_estres.universe, [60, 100, 100])
-        
-        # Productividad (0-100)
-        self.productividad['baja'] = fuzz.trimf(self.productividad.universe, [0, 0, 50])
-        self.productividad['optima'] = fuzz.trimf(self.productividad.universe, [30, 60, 90])
-        self.productividad['sobrecargada'] = fuzz.trimf(self.productividad.universe, [70, 100, 100])
+        # Plan NumPy equivalente, usado por el motor compilado y por diagnosticar_lote
+        self.plan = PlanCompilado.desde_sistema(
+            self.sistema_control,
+            tuple(self.variables[nombre] for nombre in VARIABLES_ENTRADA),
+            tuple(self.variables[nombre] for nombre in VARIABLES_SALIDA),
+            self.formas,
+            self.centroide
+        )
         
-        # Prioridad de acción (1-10)
-        self.prioridad_accion['baja'] = fuzz.trimf(self.prioridad_accion.universe, [1, 1, 5])
-        self.prioridad_accion['media'] = fuzz.trimf(self.prioridad_accion.universe, [3, 5, 7])
-        self.prioridad_accion['alta'] = fuzz.trimf(self.prioridad_accion.universe, [5, 10, 10])
+        # Regiones de entrada que dejan alguna salida sin activar
+        self.cobertura = MapaCobertura.desde_plan(self.plan, self.formas)
+    
+    def _restaurar_sistema(self, artefacto):
+        """Usa un sistema ya construido; no quedan objetos de skfuzzy ni simulador"""
+        self.formas = artefacto.formas
+        self.plan = artefacto.plan
+        self.cobertura = artefacto.cobertura
+        self.sistema_control = None
+        self.simulador = None
+    
+    @staticmethod
+    def _universo(minimo, maximo, paso):
+        """Universo de una variable entre minimo y maximo con el paso dado"""
+        if paso == 1 and float(minimo).is_integer() and float(maximo).is_integer():
+            return np.arange(int(minimo), int(maximo) + 1, 1)
+        puntos = int(round((maximo - minimo) / paso)) + 1
+        return np.linspace(minimo, maximo, puntos)
+    
+    def _configurar_pool(self):
+        """Prepara el pool de simuladores para llamadas concurrentes.
+
+        skfuzzy guarda las entradas y resultados intermedios en los objetos
+        Antecedent/Term compartidos por todas las simulaciones de un mismo
+        ControlSystem, así que cada simulador del pool usa su propia copia del
+        sistema de control. Las copias se crean bajo demanda.
+        """
+        self._pool = queue.LifoQueue()
+        self._simuladores_creados = 0
+        if self.simulador is not None:
+            self._pool.put(self.simulador)
+            self._simuladores_creados = 1
+        self._candado_pool = threading.Lock()
+        self._caminos = Counter()
+        self._candado_caminos = threading.Lock()
+        self._interno = threading.local()
+
+    @contextmanager
+    def _sin_contar(self):
+        """Evaluaciones internas (tablas, verificaciones) que no son diagnósticos pedidos.
+
+        Dentro del bloque, en este hilo, no se cuentan caminos ni se miden
+        etapas; los diagnósticos de otros hilos se siguen contando.
+        """
+        anterior = getattr(self._interno, 'activo', False)
+        self._interno.activo = True
+        try:
+            yield
+        finally:
+            self._interno.activo = anterior
+
+    def _contar(self, camino, veces=1):
+        """Registra cuántos diagnósticos siguieron cada camino"""
+        if veces and not getattr(self._interno, 'activo', False):
+            with self._candado_caminos:
+                self._caminos[camino] += veces
+            if self.instrumentacion is not None:
+                self.instrumentacion.contar(camino, veces)
+
+    def _medir(self, etapa):
+        """Context manager que mide `etapa` si la instrumentación está activa"""
+        if self.instrumentacion is None or getattr(self._interno, 'activo', False):
+            return _SIN_MEDICION
+        return self.instrumentacion.medir(etapa)
+
+    def estadisticas_caminos(self):
+        """Cuántos diagnósticos usaron el sistema difuso y cuántos el respaldo.
+
+        'respaldo_directo' son entradas que el mapa de cobertura envió al
+        cálculo manual sin intentar el difuso; 'respaldo_error' son cálculos
+        difusos que fallaron.
+        """
+        with self._candado_caminos:
+            conteos = {camino: self._caminos[camino] for camino in CAMINOS}
+        total = sum(conteos.values())
+        return {
+            **conteos,
+            'total': total,
+            'fracciones': {camino: (n / total if total else 0.0) for camino, n in conteos.items()},
+        }
+
+    @contextmanager
+    def _simulador_del_pool(self):
+        """Toma un simulador libre (o crea uno si el pool no está completo)"""
+        try:
+            simulador = self._pool.get_nowait()
+        except queue.Empty:
+            with self._candado_pool:
+                crear = self._simuladores_creados < self.tamano_pool
+                if crear:
+                    self._simuladores_creados += 1
+            if crear:
+                from skfuzzy import control as ctrl
+                simulador = ctrl.ControlSystemSimulation(copy.deepcopy(self.sistema_control))
+            else:
+                simulador = self._pool.get()
+        try:
+            yield simulador
+        except Exception:
+            # Un compute() fallido deja activaciones parciales guardadas bajo
+            # estas entradas; sin limpiar, la siguiente llamada con las mismas
+            # entradas las reutilizaría y daría otro resultado
+            simulador.reset()
+            raise
+        finally:
+            self._pool.put(simulador)
+
+    def _configurar_funciones_pertenencia(self):
+        """Configura las funciones de pertenencia de todas las variables según la configuración"""
+        self.formas = {}
+        for nombre, variable in self.variables.items():
+            for etiqueta, termino in self.configuracion['variables'][nombre]['terminos'].items():
+                self._definir_termino(variable, etiqueta, termino['forma'], termino['puntos'])
+    
+    def _definir_termino(self, variable, etiqueta, forma, puntos):
+        """Asigna un término trimf/trapmf y guarda sus puntos para el centroide analítico"""
+        import skfuzzy as fuzz
+        if forma == 'trimf':
+            variable[etiqueta] = fuzz.trimf(variable.universe, puntos)
+            puntos = [puntos[0], puntos[1], puntos[1], puntos[2]]
+        else:
+            variable[etiqueta] = fuzz.trapmf(variable.universe, puntos)
+        self.formas[(variable.label, etiqueta)] = tuple(float(p) for p in puntos)
     
     def _crear_reglas(self):
-        """Crea las reglas difusas del sistema"""
-        self.reglas = []
-        
-        # REGLAS PARA ESTRÉS ALTO - Casos extremos
-        self.reglas.append(ctrl.Rule(
-            self.satisfaccion['baja'] | self.calidad_sueno['mala'] | 
-            self.carga_mental['intensa'] | self.horas_trabajo['altas'],
-            self.nivel_estres['alto']
-        ))
-        
-        # REGLAS PARA ESTRÉS MODERADO - Combinaciones comunes
-        self.reglas.append(ctrl.Rule(
-            (self.horas_trabajo['normales'] & self.carga_mental['moderada']) |
-            (self.calidad_sueno['regular'] & self.satisfaccion['media']) |
-            (self.horas_trabajo['altas'] & self.satisfaccion['alta']),
-            self.nivel_estres['moderado']
-        ))
+        """Crea las reglas difusas del sistema, en el orden de la configuración"""
+        from skfuzzy import control as ctrl
         
-        # REGLAS PARA ESTRÉS BAJO - Condiciones ideales
-        self.reglas.append(ctrl.Rule(
-            self.horas_trabajo['bajas'] & self.calidad_sueno['buena'] & 
-            self.carga_mental['leve'] & self.satisfaccion['alta'],
-            self.nivel_estres['bajo']
-        ))
-        
-        # REGLAS DE PRODUCTIVIDAD
-        self.reglas.append(ctrl.Rule(
-            self.nivel_estres['bajo'] | self.satisfaccion['alta'], 
-            self.productividad['optima']
-        ))
-        self.reglas.append(ctrl.Rule(
-            self.nivel_estres['alto'] | self.calidad_sueno['mala'], 
-            self.productividad['baja']
-        ))
-        self.reglas.append(ctrl.Rule(
-            self.nivel_estres['moderado'] & self.horas_trabajo['altas'], 
-            self.productividad['sobrecargada']
-        ))
-        
-        # REGLAS DE PRIORIDAD
-        self.reglas.append(ctrl.Rule(
-            self.nivel_estres['alto'] | self.productividad['baja'], 
-            self.prioridad_accion['alta']
-        ))
-        self.reglas.append(ctrl.Rule(
-            self.nivel_estres['moderado'] | self.satisfaccion['baja'], 
-            self.prioridad_accion['media']
-        ))
-        self.reglas.append(ctrl.Rule(
-            self.nivel_estres['bajo'] & self.productividad['optima'], 
-            self.prioridad_accion['baja']
-        ))
-        
-        # REGLAS DE FALLBACK CRÍTICAS - Para asegurar que siempre haya salida
-        self.reglas.append(ctrl.Rule(
-            self.calidad_sueno['mala'] | self.satisfaccion['baja'], 
-            self.prioridad_accion['media']
-        ))
-        self.reglas.append(ctrl.Rule(
-            self.horas_trabajo['normales'], 
-            self.nivel_estres['moderado']
-        ))
+        self.reglas = []
+        for regla in self.configuracion['reglas']:
+            consecuentes = [self._expresion(nodo) for nodo in consecuentes_de(regla)]
+            self.reglas.append(ctrl.Rule(
+                self._expresion(analizar_expresion(regla['si'])),
+                consecuentes[0] if len(consecuentes) == 1 else consecuentes
+            ))
     
+    def _expresion(self, nodo):
+        """Traduce un árbol de analizar_expresion a términos de skfuzzy"""
+        if nodo[0] == 'termino':
+            return self.variables[nodo[1]][nodo[2]]
+        if nodo[0] == 'no':
+            return ~self._expresion(nodo[1])
+        izquierda, derecha = self._expresion(nodo[1]), self._expresion(nodo[2])
+        return izquierda & derecha if nodo[0] == 'y' else izquierda | derecha
+    
+    @_medido('total')
     def diagnosticar(self, horas, sueno, carga, satisf):
-        """Realiza diagnóstico completo con manejo de errores mejorado"""
+        """Realiza diagnóstico completo con manejo de errores mejorado.
+
+        Con la caché activada el resultado es de solo lectura (mappingproxy
+        con una tupla de recomendaciones) y se comparte entre llamadas.
+        """
+        if self.cache is None:
+            return self._diagnosticar(horas, sueno, carga, satisf)
+        
+        clave = self.cache.clave(*self._limitar(horas, sueno, carga, satisf))
+        return self.cache.obtener_o_calcular(clave, lambda: self._diagnosticar(*clave))
+
+    def _limitar(self, horas, sueno, carga, satisf):
+        """Limita cada entrada escalar al universo de su variable"""
+        return tuple(
+            max(minimo, min(maximo, valor))
+            for valor, (minimo, maximo) in zip((horas, sueno, carga, satisf), self.limites)
+        )
+
+    def _diagnosticar(self, horas, sueno, carga, satisf):
+        """Diagnóstico sin caché con el motor configurado"""
         try:
             # Validar rangos de entrada
-            horas = max(0, min(80, horas))
-            sueno = max(1, min(10, sueno))
-            carga = max(1, min(10, carga))
-            satisf = max(1, min(10, satisf))
+            horas, sueno, carga, satisf = self._limitar(horas, sueno, carga, satisf)
             
-            self.simulador.input['horas_trabajo'] = horas
-            self.simulador.input['calidad_sueno'] = sueno
-            self.simulador.input['carga_mental'] = carga
-            self.simulador.input['satisfaccion'] = satisf
+            # Entradas sin activación en alguna salida: directo al respaldo
+            if not self.cobertura.cubre(horas, sueno, carga, satisf):
+                self._contar('respaldo_directo')
+                return self._diagnostico_manual(horas, sueno, carga, satisf, MENSAJE_SIN_ACTIVACION)
             
-            self.simulador.compute()
+            if self.tabla is not None:
+                return self._diagnostico_tabla(horas, sueno, carga, satisf)
+            if self.motor == 'compilado':
+                return self._diagnostico_compilado(horas, sueno, carga, satisf)
             
+            with self._simulador_del_pool() as simulador:
+                with self._medir('entradas'):
+                    simulador.input['horas_trabajo'] = horas
+                    simulador.input['calidad_sueno'] = sueno
+                    simulador.input['carga_mental'] = carga
+                    simulador.input['satisfaccion'] = satisf
+                
+                # skfuzzy no separa fuzzificación, reglas y defuzzificación
+                with self._medir('inferencia'):
+                    simulador.compute()
+                
+                salida = dict(simulador.output)
+            
+            self._contar('difuso')
             return {
-                'nivel_estres': self.simulador.output['nivel_estres'],
-                'productividad': self.simulador.output['productividad'],
-                'prioridad_accion': self.simulador.output['prioridad_accion'],
+                'nivel_estres': salida['nivel_estres'],
+                'productividad': salida['productividad'],
+                'prioridad_accion': salida['prioridad_accion'],
                 'recomendaciones': self._generar_recomendaciones(
-                    self.simulador.output['nivel_estres'],
-                    self.simulador.output['productividad'],
-                    self.simulador.output['prioridad_accion']
+                    salida['nivel_estres'],
+                    salida['productividad'],
+                    salida['prioridad_accion']
                 )
             }
         except Exception as e:
             # Fallback: cálculo manual si el sistema difuso falla
+            self._contar('respaldo_error')
             return self._diagnostico_manual(horas, sueno, carga, satisf, str(e))
 
+    def _diagnostico_compilado(self, horas, sueno, carga, satisf):
+        """Diagnóstico con el plan NumPy precompilado"""
+        salidas, valido = self._evaluar_lote({
+            'horas_trabajo': np.array([horas], dtype=float),
+            'calidad_sueno': np.array([sueno], dtype=float),
+            'carga_mental': np.array([carga], dtype=float),
+            'satisfaccion': np.array([satisf], dtype=float),
+        })
+        if not valido[0]:
+            self._contar('respaldo_error')
+            return self._diagnostico_manual(horas, sueno, carga, satisf, MENSAJE_SIN_ACTIVACION)
+        
+        self._contar('difuso')
+        estres = float(salidas['nivel_estres'][0])
+        productividad = float(salidas['productividad'][0])
+        prioridad = float(salidas['prioridad_accion'][0])
+        return {
+            'nivel_estres': estres,
+            'productividad': productividad,
+            'prioridad_accion': prioridad,
+            'recomendaciones': self._generar_recomendaciones(estres, productividad, prioridad)
+        }
+
+    @_medido('interpolacion')
+    def _diagnostico_tabla(self, horas, sueno, carga, satisf):
+        """Diagnóstico por interpolación en la tabla precalculada"""
+        valores = self.tabla.interpolar_punto(horas, sueno, carga, satisf)
+        if valores['respaldo'] > 0:
+            # La celda toca un vértice de respaldo pero el punto está cubierto
+            # (lo comprobó _diagnosticar): se evalúa exacto con el plan
+            return self._diagnostico_compilado(horas, sueno, carga, satisf)
+        
+        self._contar('difuso')
+        estres = valores['nivel_estres']
+        productividad = valores['productividad']
+        prioridad = valores['prioridad_accion']
+        return {
+            'nivel_estres': estres,
+            'productividad': productividad,
+            'prioridad_accion': prioridad,
+            'recomendaciones': self._generar_recomendaciones(estres, productividad, prioridad)
+        }
+
+    def diagnosticar_lote(self, horas, sueno=None, carga=None, satisf=None, tamano_bloque=4096):
+        """Diagnóstico vectorizado para muchas personas en una sola llamada.
+
+        Acepta arreglos de NumPy (o cualquier secuencia) para las cuatro entradas,
+        o un DataFrame con las columnas de COLUMNAS_ENTRADA como primer argumento.
+        Devuelve un diccionario con arreglos para 'nivel_estres', 'productividad'
+        y 'prioridad_accion', más 'respaldo', que marca las filas resueltas con el
+        cálculo manual. Los resultados coinciden con diagnosticar dentro de
+        TOLERANCIA_LOTE. Las filas con alguna entrada no finita (NaN o
+        infinito) no se diagnostican: sus salidas son NaN y 'respaldo' es False.
+        """
+        if sueno is None:
+            datos = horas
+            horas, sueno, carga, satisf = (np.asarray(datos[c], dtype=float) for c in COLUMNAS_ENTRADA)
+
+        horas, sueno, carga, satisf = np.broadcast_arrays(
+            *(np.asarray(v, dtype=float) for v in (horas, sueno, carga, satisf))
+        )
+        forma = horas.shape
+
+        # np.clip deja pasar NaN y las operaciones difusas lo descartan sin
+        # avisar; esas filas se separan antes de evaluar
+        finitas = np.isfinite(horas) & np.isfinite(sueno) & np.isfinite(carga) & np.isfinite(satisf)
+        if not finitas.all():
+            parcial = self.diagnosticar_lote(horas[finitas], sueno[finitas], carga[finitas], satisf[finitas],
+                                             tamano_bloque=tamano_bloque)
+            resultado = {nombre: np.full(forma, np.nan) for nombre in ('nivel_estres', 'productividad', 'prioridad_accion')}
+            resultado['respaldo'] = np.zeros(forma, dtype=bool)
+            for nombre, valores in parcial.items():
+                resultado[nombre][finitas] = valores
+            return resultado
+
+        # Validar rangos de entrada (igual que en diagnosticar)
+        entradas = {
+            nombre: np.clip(valores.ravel(), minimo, maximo)
+            for nombre, valores, (minimo, maximo) in zip(COLUMNAS_ENTRADA, (horas, sueno, carga, satisf), self.limites)
+        }
+
+        if self.tabla is not None:
+            return self._lote_tabla(entradas, forma, tamano_bloque)
+
+        total = entradas['horas_trabajo'].size
+        resultado = {
+            'nivel_estres': np.empty(total),
+            'productividad': np.empty(total),
+            'prioridad_accion': np.empty(total),
+            'respaldo': ~self.cobertura.cubre_lote(entradas),
+        }
+
+        # Solo las filas cubiertas pasan por el sistema difuso, por bloques
+        # para acotar la memoria de los arreglos intermedios
+        cubiertas = np.flatnonzero(~resultado['respaldo'])
+        filas_bloque = max(1, min(tamano_bloque, ELEMENTOS_POR_BLOQUE // self.plan.elementos_por_fila))
+        for inicio in range(0, cubiertas.size, filas_bloque):
+            bloque = cubiertas[inicio:inicio + filas_bloque]
+            salidas, valido = self._evaluar_lote({k: v[bloque] for k, v in entradas.items()})
+            for nombre, valores in salidas.items():
+                resultado[nombre][bloque] = valores
+            resultado['respaldo'][bloque] = ~valido
+
+        fallidas = resultado['respaldo']
+        self._contar('difuso', total - int(fallidas.sum()))
+        self._contar('respaldo_directo', total - cubiertas.size)
+        self._contar('respaldo_error', cubiertas.size - (total - int(fallidas.sum())))
+
+        # Fallback: cálculo manual para las filas sin activación suficiente
+        if fallidas.any():
+            with self._medir('respaldo'):
+                estres, productividad, prioridad = self._calculo_lineal(
+                    entradas['horas_trabajo'][fallidas],
+                    entradas['calidad_sueno'][fallidas],
+                    entradas['carga_mental'][fallidas],
+                    entradas['satisfaccion'][fallidas]
+                )
+                resultado['nivel_estres'][fallidas] = estres
+                resultado['productividad'][fallidas] = productividad
+                resultado['prioridad_accion'][fallidas] = prioridad
+
+        return {nombre: valores.reshape(forma) for nombre, valores in resultado.items()}
+
+    def diagnosticar_incierto(self, horas, sueno, carga, satisf, muestras=2000, ruido=None, semilla=None,
+                              percentiles=(5, 25, 50, 75, 95)):
+        """Distribución del diagnóstico cuando las entradas son inciertas.
+
+        Perturba cada entrada con ruido uniforme de ±ruido[variable] (por
+        defecto RUIDO_SUBJETIVO), evalúa todas las muestras en una sola
+        llamada a diagnosticar_lote y resume cada salida con su media,
+        desviación y percentiles. Las muestras fuera de rango se limitan
+        igual que en diagnosticar. 'prob_estres_alto' es la fracción de
+        muestras con nivel_estres > UMBRAL_ESTRES_ALTO.
+        """
+        ruido = RUIDO_SUBJETIVO if ruido is None else ruido
+        desconocidas = set(ruido) - set(COLUMNAS_ENTRADA)
+        if desconocidas:
+            raise ValueError(f"Variables desconocidas en ruido: {', '.join(sorted(desconocidas))}")
+        if muestras < 1:
+            raise ValueError("muestras debe ser al menos 1")
+        if any(amplitud < 0 for amplitud in ruido.values()):
+            raise ValueError("El ruido no puede ser negativo")
+
+        rng = np.random.default_rng(semilla)
+        entradas = [
+            valor + rng.uniform(-ruido.get(nombre, 0.), ruido.get(nombre, 0.), muestras)
+            for nombre, valor in zip(COLUMNAS_ENTRADA, (horas, sueno, carga, satisf))
+        ]
+        resultado = self.diagnosticar_lote(*entradas)
+
+        resumen = {'muestras': muestras}
+        for nombre in ('nivel_estres', 'productividad', 'prioridad_accion'):
+            valores = resultado[nombre]
+            resumen[nombre] = {
+                'media': float(valores.mean()),
+                'desviacion': float(valores.std()),
+                'percentiles': dict(zip(percentiles, np.percentile(valores, percentiles).tolist())),
+            }
+        resumen['prob_estres_alto'] = float((resultado['nivel_estres'] > UMBRAL_ESTRES_ALTO).mean())
+        resumen['fraccion_respaldo'] = float(resultado['respaldo'].mean())
+        return resumen
+
+    def malla_sensibilidad(self, eje_x, eje_y, fijos, puntos=41):
+        """Evalúa las salidas sobre una malla de dos entradas con las demás fijas.
+
+        `fijos` asocia cada entrada con su valor (se ignoran eje_x y eje_y);
+        lanza ValueError si falta alguna de las otras dos.
+        Devuelve (valores_x, valores_y, resultado), donde resultado es el de
+        diagnosticar_lote con arreglos de forma (len(valores_y), len(valores_x)),
+        listo para un heatmap.
+        """
+        if eje_x == eje_y or eje_x not in COLUMNAS_ENTRADA or eje_y not in COLUMNAS_ENTRADA:
+            raise ValueError(f"eje_x y eje_y deben ser dos entradas distintas de: {', '.join(COLUMNAS_ENTRADA)}")
+        faltantes = [nombre for nombre in COLUMNAS_ENTRADA if nombre not in (eje_x, eje_y) and nombre not in fijos]
+        if faltantes:
+            raise ValueError(f"Falta el valor fijo de: {', '.join(faltantes)}")
+        limites = dict(zip(COLUMNAS_ENTRADA, self.limites))
+        valores_x = np.linspace(*limites[eje_x], puntos)
+        valores_y = np.linspace(*limites[eje_y], puntos)
+        malla_x, malla_y = np.meshgrid(valores_x, valores_y)
+        entradas = {nombre: fijos.get(nombre) for nombre in COLUMNAS_ENTRADA}
+        entradas[eje_x], entradas[eje_y] = malla_x, malla_y
+        return valores_x, valores_y, self.diagnosticar_lote(*(entradas[nombre] for nombre in COLUMNAS_ENTRADA))
+
+    def buscar_intervenciones(self, horas, sueno, carga, satisf, objetivo=40, costos=None, max_resultados=5):
+        """Cambios mínimos en las entradas que llevan nivel_estres por debajo de `objetivo`.
+
+        Devuelve hasta max_resultados intervenciones ordenadas por costo, cada
+        una con los cambios, las entradas resultantes, el diagnóstico que se
+        obtendría y una descripción legible. `costos` ajusta el costo por
+        unidad de cada entrada (ver COSTOS_CAMBIO); None la deja fija. La
+        búsqueda usa la tabla de la malla entera, que se construye (o se carga
+        de directorio_tabla) en la primera llamada.
+        """
+        actual = self._limitar(horas, sueno, carga, satisf)
+        # La tabla y las verificaciones no son diagnósticos de personas
+        with self._sin_contar():
+            return buscar_intervenciones(self, self._tabla_malla_entera(), actual, objetivo, costos, max_resultados)
+
+    def _tabla_malla_entera(self):
+        """Tabla de respuesta con paso 1; reutiliza la del motor 'tabla' si coincide"""
+        if self.tabla is not None and all(np.allclose(np.diff(eje), 1) for eje in self.tabla.ejes):
+            return self.tabla
+        with self._candado_tabla:
+            if self._tabla_entera is None:
+                self._tabla_entera = TablaRespuesta.cargar_o_construir(self, 1.0, self.directorio_tabla)
+            return self._tabla_entera
+
+    def recomendaciones_lote(self, nivel_estres, productividad, prioridad_accion):
+        """Recomendaciones de cada fila de un resultado de diagnosticar_lote"""
+        codigos = codigo_recomendaciones(np.ravel(nivel_estres), np.ravel(productividad), np.ravel(prioridad_accion))
+        return [materializar(codigo) for codigo in codigos.tolist()]
+
+    def diagnosticar_compacto(self, horas, sueno=None, carga=None, satisf=None, directorio=None,
+                              filas_por_bloque=65_536):
+        """Como diagnosticar_lote, pero devuelve un ResultadoLote de 14 bytes por fila.
+
+        Las entradas se procesan en bloques de `filas_por_bloque`, así que la
+        memoria adicional no crece con el número de filas. Con `directorio`
+        el resultado se escribe en archivos .npy con memmap en lugar de en
+        memoria. Las salidas se guardan en float32; los códigos de
+        recomendación se calculan antes de redondear, con los valores
+        exactos. Las filas quedan en el orden de np.ravel de las entradas.
+        """
+        from utils.resultado_lote import ResultadoLote  # resultado_lote importa este módulo
+
+        if sueno is None:
+            datos = horas
+            horas, sueno, carga, satisf = (datos[c] for c in COLUMNAS_ENTRADA)
+        # Sin convertir a float aquí: cada bloque se convierte por separado
+        entradas = [np.ravel(v) for v in np.broadcast_arrays(*(np.asarray(v) for v in (horas, sueno, carga, satisf)))]
+        filas = entradas[0].size
+
+        resultado = ResultadoLote.crear(filas, directorio)
+        for inicio in range(0, filas, filas_por_bloque):
+            bloque = slice(inicio, inicio + filas_por_bloque)
+            salida = self.diagnosticar_lote(*(valores[bloque] for valores in entradas))
+            for nombre in ('nivel_estres', 'productividad', 'prioridad_accion', 'respaldo'):
+                resultado.columnas[nombre][bloque] = salida[nombre]
+            resultado.columnas['codigo'][bloque] = codigo_recomendaciones(
+                salida['nivel_estres'], salida['productividad'], salida['prioridad_accion']
+            )
+        resultado.flush()
+        return resultado
+
+    def _lote_tabla(self, entradas, forma, tamano_bloque):
+        """Diagnóstico vectorizado interpolando en la tabla precalculada"""
+        total = entradas['horas_trabajo'].size
+        cubiertas = self.cobertura.cubre_lote(entradas)
+        valores = self.tabla.interpolar(*(entradas[c] for c in COLUMNAS_ENTRADA))
+        resultado = {
+            'nivel_estres': valores['nivel_estres'].astype(float),
+            'productividad': valores['productividad'].astype(float),
+            'prioridad_accion': valores['prioridad_accion'].astype(float),
+            'respaldo': ~cubiertas,
+        }
+
+        # Los puntos cubiertos en celdas con algún vértice de respaldo no se
+        # pueden interpolar: se evalúan exactos con el plan
+        exactas = np.flatnonzero(cubiertas & (valores['respaldo'] > 0))
+        filas_bloque = max(1, min(tamano_bloque, ELEMENTOS_POR_BLOQUE // self.plan.elementos_por_fila))
+        for inicio in range(0, exactas.size, filas_bloque):
+            bloque = exactas[inicio:inicio + filas_bloque]
+            salidas, valido = self._evaluar_lote({k: v[bloque] for k, v in entradas.items()})
+            for nombre, valores_bloque in salidas.items():
+                resultado[nombre][bloque] = valores_bloque
+            resultado['respaldo'][bloque] = ~valido
+
+        fallidas = resultado['respaldo']
+        directas = total - int(cubiertas.sum())
+        self._contar('difuso', total - int(fallidas.sum()))
+        self._contar('respaldo_directo', directas)
+        self._contar('respaldo_error', int(fallidas.sum()) - directas)
+
+        if fallidas.any():
+            with self._medir('respaldo'):
+                estres, productividad, prioridad = self._calculo_lineal(
+                    *(entradas[c][fallidas] for c in COLUMNAS_ENTRADA)
+                )
+            resultado['nivel_estres'][fallidas] = estres
+            resultado['productividad'][fallidas] = productividad
+            resultado['prioridad_accion'][fallidas] = prioridad
+
+        return {nombre: valores.reshape(forma) for nombre, valores in resultado.items()}
+
+    def _evaluar_lote(self, entradas):
+        """Fuzzifica, dispara las reglas y defuzzifica un bloque de entradas"""
+        return self.plan.evaluar(entradas, self._medir)
+
+    @_medido('respaldo')
     def _diagnostico_manual(self, horas, sueno, carga, satisf, error_msg):
         """Cálculo manual de respaldo cuando el sistema difuso falla"""
         
+        nivel_estres, productividad, prioridad_accion = self._calculo_lineal(horas, sueno, carga, satisf)
+        
+        return {
+            'nivel_estres': nivel_estres,
+            'productividad': productividad,
+            'prioridad_accion': prioridad_accion,
+            'recomendaciones': self._generar_recomendaciones(nivel_estres, productividad, prioridad_accion),
+            'advertencia': f"Sistema difuso temporalmente no disponible. {error_msg}"
+        }
+    
+    @staticmethod
+    def _calculo_lineal(horas, sueno, carga, satisf):
+        """Cálculo lineal del respaldo; acepta escalares o arreglos"""
         # Cálculos simples basados en lógica lineal
         nivel_estres = (
             (horas / 80 * 30) + 
@@ -171,66 +703,23 @@ class SistemaBienestarLaboral:
             ((10 - satisf) / 10 * 10)
         )
         
-        productividad = max(20, 100 - nivel_estres + 15)
+        productividad = np.maximum(20, 100 - nivel_estres + 15)
         prioridad_accion = (nivel_estres / 100) * 8 + 2
         
         # Asegurar rangos válidos
-        nivel_estres = max(0, min(100, nivel_estres))
-        productividad = max(0, min(100, productividad))
-        prioridad_accion = max(1, min(10, prioridad_accion))
+        nivel_estres = np.clip(nivel_estres, 0, 100)
+        productividad = np.clip(productividad, 0, 100)
+        prioridad_accion = np.clip(prioridad_accion, 1, 10)
         
-        return {
-            'nivel_estres': nivel_estres,
-            'productividad': productividad,
-            'prioridad_accion': prioridad_accion,
-            'recomendaciones': self._generar_recomendaciones(nivel_estres, productividad, prioridad_accion),
-            'advertencia': f"Sistema difuso temporalmente no disponible. {error_msg}"
-        }
+        return nivel_estres, productividad, prioridad_accion
     
+    @_medido('recomendaciones')
     def _generar_recomendaciones(self, estres, productividad, prioridad):
         """Genera recomendaciones basadas en los resultados del diagnóstico"""
-        recomendaciones = []
-        
-        # Recomendaciones por nivel de estrés
-        if estres > 70:
-            recomendaciones.extend([
-                {"tipo": "🚨 CRÍTICO", "mensaje": "Nivel de estrés crítico detectado", "accion": "Consulta inmediata con profesional"},
-                {"tipo": "🩺 SALUD", "mensaje": "Considerar días de descanso urgentes", "accion": "Coordinar con RRHH"},
-                {"tipo": "⚖️ CARGA", "mensaje": "Revisión urgente de carga laboral", "accion": "Hablar con supervisor"}
-            ])
-        elif estres > 40:
-            recomendaciones.extend([
-                {"tipo": "⚠️ ALERTA", "mensaje": "Estrés moderado - atención requerida", "accion": "Implementar técnicas de relajación"},
-                {"tipo": "😴 SUEÑO", "mensaje": "Mejorar higiene de sueño", "accion": "Establecer rutina nocturna"},
-                {"tipo": "⏰ LÍMITES", "mensaje": "Establecer límites laborales claros", "accion": "Definir horarios de desconexión"}
-            ])
-        else:
-            recomendaciones.append({
-                "tipo": "✅ ÓPTIMO", 
-                "mensaje": "Nivel de estrés saludable", 
-                "accion": "Mantener buenos hábitos actuales"
-            })
-        
-        # Recomendaciones por productividad
-        if productividad < 50:
-            recomendaciones.extend([
-                {"tipo": "📉 PRODUCTIVIDAD", "mensaje": "Productividad por debajo del óptimo", "accion": "Revisar distribución de tareas"},
-                {"tipo": "🎯 ENFOQUE", "mensaje": "Implementar técnicas de concentración", "accion": "Usar método Pomodoro"},
-                {"tipo": "🚫 DISTRACCIONES", "mensaje": "Identificar y eliminar distracciones", "accion": "Bloquear notificaciones innecesarias"}
-            ])
-        elif productividad > 80:
-            recomendaciones.append({
-                "tipo": "🔥 SOBRECARGA", 
-                "mensaje": "Productividad muy alta - riesgo de burnout", 
-                "accion": "Evaluar sostenibilidad del ritmo"
-            })
-        
-        # Recomendación por prioridad
-        if prioridad > 7:
-            recomendaciones.append({
-                "tipo": "🎯 PRIORIDAD", 
-                "mensaje": "ACCIÓN INMEDIATA REQUERIDA", 
-                "accion": "Implementar recomendaciones urgentemente"
-            })
-        
-        return recomendaciones
+        return materializar(codigo_recomendaciones(estres, productividad, prioridad))
+
+
+if __name__ == '__main__':
+    import sys
+    from utils.puntuacion import main
+    sys.exit(main())
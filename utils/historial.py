@@ -0,0 +1,231 @@
+"""Historial semanal de diagnósticos por empleado.
+
+Cada columna se guarda en su propio archivo binario de float32 (la racha en
+int16) con una fila por semana registrada y una posición fija por empleado.
+Agregar una semana escribe una fila al final de cada archivo y solo puntúa
+las filas nuevas; la tendencia de un empleado lee su columna con memmap sin
+cargar el resto del historial.
+
+Las estadísticas móviles se calculan al registrar cada semana a partir de
+las tres anteriores y se guardan como columnas más:
+    media_estres_4_semanas  media de nivel_estres en las últimas 4 semanas registradas
+    variacion_semanal       nivel_estres menos el de la semana registrada anterior
+    semanas_estres_alto     semanas registradas seguidas con nivel_estres > UMBRAL_ESTRES_ALTO
+"""
+import datetime
+import json
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.fuzzy_system import COLUMNAS_ENTRADA, UMBRAL_ESTRES_ALTO
+from utils.puntuacion import puntuar_bloque
+
+# Directorio por defecto del historial; a diferencia de DIRECTORIO_CACHE no se puede regenerar
+DIRECTORIO_HISTORIAL = os.path.join(os.path.expanduser('~'), '.local', 'share', 'bienestar_laboral', 'historial')
+
+# Se incrementa si cambia el formato de los archivos
+VERSION_HISTORIAL = 1
+
+COLUMNA_EMPLEADO = 'id_empleado'
+
+# Columnas guardadas y su tipo; una semana sin datos de un empleado queda en NaN (o 0 en la racha)
+COLUMNAS_HISTORIAL = {
+    **{columna: np.float32 for columna in COLUMNAS_ENTRADA},
+    'nivel_estres': np.float32,
+    'productividad': np.float32,
+    'prioridad_accion': np.float32,
+    'media_estres_4_semanas': np.float32,
+    'variacion_semanal': np.float32,
+    'semanas_estres_alto': np.int16,
+}
+
+_FORMATO_SEMANA = re.compile(r'^\d{4}-W\d{2}$')
+
+
+def semana_iso(fecha=None):
+    """Semana ISO de una fecha (por defecto, hoy) como 'AAAA-Wss'"""
+    anio, semana, _ = (fecha or datetime.date.today()).isocalendar()
+    return f"{anio}-W{semana:02d}"
+
+
+class HistorialBienestar:
+    """Entradas y diagnósticos semanales de cada empleado en un directorio.
+
+    Solo se puede registrar la última semana (para completar o corregir
+    empleados) o una posterior. Un solo proceso debe escribir a la vez.
+    """
+
+    def __init__(self, directorio=DIRECTORIO_HISTORIAL, capacidad_inicial=1024):
+        self.directorio = directorio
+        self._candado = threading.Lock()
+        os.makedirs(directorio, exist_ok=True)
+        try:
+            with open(self._ruta('meta.json'), encoding='utf-8') as archivo:
+                meta = json.load(archivo)
+        except FileNotFoundError:
+            meta = {'version': VERSION_HISTORIAL, 'capacidad': capacidad_inicial, 'empleados': [],
+                    'semanas': [], 'firmas': []}
+        if meta.get('version') != VERSION_HISTORIAL:
+            raise ValueError(f"Historial de otra versión en {directorio}: {meta.get('version')}")
+        self.capacidad = meta['capacidad']
+        self.empleados = meta['empleados']
+        self.semanas = meta['semanas']
+        self.firmas = meta['firmas']
+        self._posiciones = {empleado: i for i, empleado in enumerate(self.empleados)}
+        for columna in COLUMNAS_HISTORIAL:
+            # Descarta una fila a medio escribir si el proceso se detuvo antes de guardar meta.json
+            with open(self._ruta(f"{columna}.bin"), 'ab') as archivo:
+                archivo.truncate(self._bytes_fila(columna) * len(self.semanas))
+
+    def registrar_semana(self, semana, datos, sistema):
+        """Diagnostica las filas de `datos` y las guarda en `semana`.
+
+        `datos` es un DataFrame con COLUMNA_EMPLEADO y las columnas de
+        entrada. Solo se puntúan estas filas; las de semanas anteriores no se
+        vuelven a leer salvo las tres previas de estos empleados para las
+        estadísticas móviles. Las filas con entradas inválidas quedan sin
+        diagnóstico. Devuelve el número de filas diagnosticadas.
+        """
+        if not _FORMATO_SEMANA.match(semana):
+            raise ValueError(f"Semana inválida: {semana!r}; se espera 'AAAA-Wss'")
+        if COLUMNA_EMPLEADO not in datos:
+            raise ValueError(f"Falta la columna '{COLUMNA_EMPLEADO}'")
+        ids = datos[COLUMNA_EMPLEADO].astype(str)
+        if ids.duplicated().any():
+            raise ValueError(f"Empleados repetidos en la semana: {', '.join(ids[ids.duplicated()].unique()[:5])}")
+
+        with self._candado:
+            if self.semanas and semana < self.semanas[-1]:
+                raise ValueError(f"Solo se puede registrar {self.semanas[-1]} o una semana posterior")
+            nueva = not self.semanas or semana > self.semanas[-1]
+
+            resultado = puntuar_bloque(datos, sistema)
+            # Entradas no finitas ya traen error; se exige además un estrés finito
+            validas = resultado['error'].isna().to_numpy() & np.isfinite(
+                resultado['nivel_estres'].to_numpy(dtype=float))
+            posiciones = self._asignar_posiciones(ids)
+
+            if nueva:
+                self._agregar_fila()
+            fila = len(self.semanas) if nueva else len(self.semanas) - 1
+            valores = self._calcular_fila(resultado, validas, posiciones, fila)
+            for columna, valores_columna in valores.items():
+                memoria = self._abrir(columna, 'r+', fila + 1)
+                memoria[fila, posiciones] = valores_columna
+                memoria.flush()
+
+            if nueva:
+                self.semanas.append(semana)
+                self.firmas.append(sistema.firma_configuracion)
+            self._guardar_meta()
+        return int(validas.sum())
+
+    def tendencia(self, empleado):
+        """DataFrame con una fila por semana registrada para `empleado` (vacío si no existe)"""
+        posicion = self._posiciones.get(str(empleado))
+        if posicion is None:
+            return pd.DataFrame(columns=list(COLUMNAS_HISTORIAL), index=pd.Index([], name='semana'))
+        filas = len(self.semanas)
+        datos = {columna: np.array(self._abrir(columna, 'r', filas)[:, posicion]) for columna in COLUMNAS_HISTORIAL}
+        tendencia = pd.DataFrame(datos, index=pd.Index(self.semanas, name='semana'))
+        # Quitar las semanas anteriores a su primer registro
+        registradas = np.flatnonzero(~np.isnan(tendencia['horas_trabajo'].to_numpy()))
+        return tendencia.iloc[registradas[0]:] if registradas.size else tendencia.iloc[:0]
+
+    def datos_semana(self, semana=None):
+        """DataFrame con un empleado por fila para `semana` (por defecto, la última)"""
+        if not self.semanas:
+            return pd.DataFrame(columns=[COLUMNA_EMPLEADO, *COLUMNAS_HISTORIAL])
+        fila = self.semanas.index(semana) if semana is not None else len(self.semanas) - 1
+        datos = {
+            columna: np.array(self._abrir(columna, 'r', fila + 1)[fila, :len(self.empleados)])
+            for columna in COLUMNAS_HISTORIAL
+        }
+        tabla = pd.DataFrame({COLUMNA_EMPLEADO: self.empleados, **datos})
+        return tabla[~np.isnan(tabla['horas_trabajo'].to_numpy())].reset_index(drop=True)
+
+    def _calcular_fila(self, resultado, validas, posiciones, fila):
+        """Valores de la fila `fila` para estos empleados, con las estadísticas móviles"""
+        valores = {
+            columna: np.where(validas, pd.to_numeric(resultado[columna], errors='coerce'), np.nan).astype(np.float32)
+            for columna in (*COLUMNAS_ENTRADA, 'nivel_estres', 'productividad', 'prioridad_accion')
+        }
+        estres = valores['nivel_estres']
+
+        inicio = max(fila - 3, 0)
+        anteriores = self._abrir('nivel_estres', 'r', fila + 1)[inicio:fila, posiciones]
+        ventana = np.vstack([anteriores, estres[None, :]])
+        # Sin diagnóstico válido esta semana no hay media, igual que en las semanas sin datos
+        cuenta = (~np.isnan(ventana)).sum(axis=0)
+        valores['media_estres_4_semanas'] = np.where(
+            np.isnan(estres), np.nan, np.nansum(ventana, axis=0) / np.maximum(cuenta, 1)
+        ).astype(np.float32)
+        if fila > 0:
+            valores['variacion_semanal'] = (estres - anteriores[-1]).astype(np.float32)
+            racha_anterior = self._abrir('semanas_estres_alto', 'r', fila + 1)[fila - 1, posiciones]
+        else:
+            valores['variacion_semanal'] = np.full(len(estres), np.nan, dtype=np.float32)
+            racha_anterior = np.zeros(len(estres), dtype=np.int16)
+        valores['semanas_estres_alto'] = np.where(estres > UMBRAL_ESTRES_ALTO, racha_anterior + 1, 0).astype(np.int16)
+        return valores
+
+    def _asignar_posiciones(self, ids):
+        """Posición de cada empleado; agrega los nuevos y amplía la capacidad si hace falta"""
+        nuevos = [empleado for empleado in ids.unique() if empleado not in self._posiciones]
+        for empleado in nuevos:
+            self._posiciones[empleado] = len(self.empleados)
+            self.empleados.append(empleado)
+        if len(self.empleados) > self.capacidad:
+            capacidad = self.capacidad
+            while capacidad < len(self.empleados):
+                capacidad *= 2
+            self._ampliar(capacidad)
+        return ids.map(self._posiciones).to_numpy()
+
+    def _ampliar(self, capacidad):
+        """Reescribe cada archivo con más posiciones por fila; al duplicar, el costo se amortiza"""
+        filas = len(self.semanas)
+        for columna, tipo in COLUMNAS_HISTORIAL.items():
+            ruta = self._ruta(f"{columna}.bin")
+            anterior = np.array(self._abrir(columna, 'r', filas)) if filas else np.empty((0, self.capacidad), tipo)
+            ampliado = np.full((filas, capacidad), _vacio(tipo), dtype=tipo)
+            ampliado[:, :self.capacidad] = anterior
+            temporal = f"{ruta}.{os.getpid()}.tmp"
+            ampliado.tofile(temporal)
+            os.replace(temporal, ruta)
+        self.capacidad = capacidad
+        self._guardar_meta()
+
+    def _agregar_fila(self):
+        for columna, tipo in COLUMNAS_HISTORIAL.items():
+            with open(self._ruta(f"{columna}.bin"), 'ab') as archivo:
+                np.full(self.capacidad, _vacio(tipo), dtype=tipo).tofile(archivo)
+
+    def _abrir(self, columna, modo, filas):
+        if filas == 0:
+            return np.empty((0, self.capacidad), dtype=COLUMNAS_HISTORIAL[columna])
+        return np.memmap(self._ruta(f"{columna}.bin"), dtype=COLUMNAS_HISTORIAL[columna], mode=modo,
+                         shape=(filas, self.capacidad))
+
+    def _guardar_meta(self):
+        """meta.json se escribe al final y de forma atómica: marca qué filas son válidas"""
+        ruta = self._ruta('meta.json')
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump({'version': VERSION_HISTORIAL, 'capacidad': self.capacidad, 'empleados': self.empleados,
+                       'semanas': self.semanas, 'firmas': self.firmas}, archivo, ensure_ascii=False)
+        os.replace(temporal, ruta)
+
+    def _bytes_fila(self, columna):
+        return self.capacidad * np.dtype(COLUMNAS_HISTORIAL[columna]).itemsize
+
+    def _ruta(self, nombre):
+        return os.path.join(self.directorio, nombre)
+
+
+def _vacio(tipo):
+    return np.nan if np.issubdtype(tipo, np.floating) else 0
@@ -0,0 +1,75 @@
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class Instrumentacion:
+    """Tiempos por etapa y contadores de eventos de SistemaBienestarLaboral.
+
+    Guarda las últimas `max_muestras` duraciones de cada etapa para calcular
+    percentiles y, si se indica `callback`, lo llama con
+    (tipo, nombre, valor) por cada medición ('etapa', segundos) o evento
+    ('contador', veces), por ejemplo para enviarlos a un colector propio.
+    Las etapas pueden anidarse: 'recomendaciones' se mide también dentro de
+    'respaldo' y todas dentro de 'total'.
+    """
+
+    def __init__(self, callback=None, max_muestras=10_000):
+        self.callback = callback
+        self.max_muestras = max_muestras
+        self._muestras = defaultdict(lambda: deque(maxlen=self.max_muestras))
+        self._conteos = Counter()
+        self._contadores = Counter()
+        self._candado = threading.Lock()
+
+    @contextmanager
+    def medir(self, etapa):
+        """Mide la duración del bloque y la registra bajo `etapa`"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(etapa, time.perf_counter() - inicio)
+
+    def registrar(self, etapa, segundos):
+        with self._candado:
+            self._muestras[etapa].append(segundos)
+            self._conteos[etapa] += 1
+        if self.callback is not None:
+            self.callback('etapa', etapa, segundos)
+
+    def contar(self, evento, veces=1):
+        with self._candado:
+            self._contadores[evento] += veces
+        if self.callback is not None:
+            self.callback('contador', evento, veces)
+
+    def resumen(self):
+        """Percentiles (en milisegundos) por etapa y contadores acumulados"""
+        with self._candado:
+            muestras = {etapa: np.array(valores) for etapa, valores in self._muestras.items()}
+            conteos = dict(self._conteos)
+            contadores = dict(self._contadores)
+
+        etapas = {}
+        for etapa, valores in muestras.items():
+            if not len(valores):
+                continue
+            p50, p95, p99 = np.percentile(valores, [50, 95, 99]) * 1e3
+            etapas[etapa] = {
+                'llamadas': conteos[etapa],
+                'media_ms': float(valores.mean() * 1e3),
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'p99_ms': float(p99),
+            }
+        return {'etapas': etapas, 'contadores': contadores}
+
+    def reiniciar(self):
+        with self._candado:
+            self._muestras.clear()
+            self._conteos.clear()
+            self._contadores.clear()
@@ -0,0 +1,281 @@
+import itertools
+from contextlib import nullcontext
+
+import numpy as np
+
+# Métodos de defuzzificación por centroide soportados
+CENTROIDES = ('muestreado', 'analitico')
+
+
+class PlanCompilado:
+    """Plan de evaluación precompilado de un ControlSystem de skfuzzy.
+
+    Cada término y cada subexpresión de las reglas ocupa un registro; las
+    reglas se traducen a una lista de instrucciones (min, max, not, peso,
+    acumular) que se ejecutan con NumPy sobre arreglos de entradas, en el
+    mismo orden en que skfuzzy dispara las reglas. No guarda estado entre
+    llamadas, así que puede usarse desde varios hilos a la vez.
+
+    Con centroide='muestreado' la defuzzificación reproduce a skfuzzy sobre
+    el universo discreto; con 'analitico' integra las formas trapezoidales
+    exactas, sin depender del paso del universo.
+    """
+
+    def __init__(self, entradas, instrucciones, salidas, num_registros, centroide='muestreado'):
+        # entradas: [(etiqueta, universo, [(registro, mf), ...]), ...]
+        # salidas: [(etiqueta, universo, [(registro, mf, puntos), ...]), ...]
+        self.entradas = entradas
+        self.instrucciones = instrucciones
+        self.salidas = salidas
+        self.num_registros = num_registros
+        self.centroide = centroide
+
+    @property
+    def elementos_por_fila(self):
+        """Tamaño de los arreglos intermedios más grandes por fila evaluada"""
+        if self.centroide == 'analitico':
+            return max(4 * len(terminos) ** 2 + 4 * len(terminos) + 2 for _, _, terminos in self.salidas)
+        return max(universo.size * (len(terminos) + 1) for _, universo, terminos in self.salidas)
+
+    @classmethod
+    def desde_sistema(cls, sistema_control, antecedentes, consecuentes, formas=None, centroide='muestreado'):
+        """Compila las variables y reglas de un ControlSystem.
+
+        `formas` asocia (variable, término) con los puntos (a, b, c, d) de un
+        trapecio; es obligatorio para centroide='analitico'.
+        """
+        from skfuzzy.control.term import TermAggregate
+
+        if centroide not in CENTROIDES:
+            raise ValueError(f"Centroide desconocido: {centroide}. Opciones: {', '.join(CENTROIDES)}")
+        formas = formas or {}
+        if centroide == 'analitico':
+            faltantes = [f"{c.label}[{t}]" for c in consecuentes for t in c.terms if (c.label, t) not in formas]
+            if faltantes:
+                raise ValueError(f"Faltan los puntos de forma para: {', '.join(faltantes)}")
+
+        registros = {}
+        contador = itertools.count()
+        instrucciones = []
+
+        def registro_de(termino):
+            if termino not in registros:
+                registros[termino] = next(contador)
+            return registros[termino]
+
+        def compilar(expresion, regla):
+            if not isinstance(expresion, TermAggregate):
+                return registro_de(expresion)
+            izquierda = compilar(expresion.term1, regla)
+            destino = next(contador)
+            if expresion.kind == 'not':
+                instrucciones.append(('not', destino, izquierda, None))
+                return destino
+            derecha = compilar(expresion.term2, regla)
+            if expresion.kind == 'and' and regla.and_func is np.fmin:
+                instrucciones.append(('min', destino, izquierda, derecha))
+            elif expresion.kind == 'or' and regla.or_func is np.fmax:
+                instrucciones.append(('max', destino, izquierda, derecha))
+            else:
+                raise ValueError(f"Operación no soportada por el motor compilado: {regla}")
+            return destino
+
+        entradas = [
+            (antecedente.label, np.asarray(antecedente.universe, dtype=float),
+             [(registro_de(t), np.asarray(t.mf, dtype=float)) for t in antecedente.terms.values()])
+            for antecedente in antecedentes
+        ]
+
+        for regla in sistema_control.rules:
+            disparo = compilar(regla.antecedent, regla)
+            for consecuente in regla.consequent:
+                activacion = disparo
+                if consecuente.weight != 1.:
+                    activacion = next(contador)
+                    instrucciones.append(('peso', activacion, disparo, consecuente.weight))
+                instrucciones.append(('acumular', registro_de(consecuente.term), activacion, None))
+
+        salidas = [
+            (consecuente.label, np.asarray(consecuente.universe, dtype=float),
+             [(registro_de(t), np.asarray(t.mf, dtype=float), formas.get((consecuente.label, etiqueta)))
+              for etiqueta, t in consecuente.terms.items()])
+            for consecuente in consecuentes
+        ]
+
+        return cls(entradas, instrucciones, salidas, next(contador), centroide)
+
+    def evaluar(self, entradas, medir=None):
+        """Evalúa el plan para un bloque de entradas.
+
+        `entradas` asocia la etiqueta de cada antecedente con un arreglo 1-D
+        ya limitado a su universo. Devuelve un diccionario de salidas y una
+        máscara con las filas que tienen área distinta de cero en todas ellas.
+        `medir(etapa)`, si se indica, debe devolver un context manager que
+        mida cada etapa.
+        """
+        medir = medir or _sin_medicion
+        with medir('fuzzificacion'):
+            registros = self._fuzzificar(entradas)
+        with medir('reglas'):
+            self._aplicar_reglas(registros)
+        with medir('defuzzificacion'):
+            return self._defuzzificar(entradas, registros)
+
+    def _defuzzificar(self, entradas, registros):
+        """Centroide de cada salida a partir de los registros ya disparados"""
+        filas = len(next(iter(entradas.values())))
+        salidas = {}
+        valido = np.ones(filas, dtype=bool)
+        for etiqueta, universo, terminos in self.salidas:
+            activos = [(r, mf, puntos) for r, mf, puntos in terminos if registros[r] is not None]
+            if not activos:
+                salidas[etiqueta] = np.full(filas, np.nan)
+                valido[:] = False
+                continue
+            cortes = [registros[r] for r, _, _ in activos]
+            if self.centroide == 'analitico':
+                salidas[etiqueta], con_area = centroide_analitico(
+                    universo[0], universo[-1], [puntos for _, _, puntos in activos], cortes
+                )
+            else:
+                salidas[etiqueta], con_area = centroide_lote(
+                    universo, [mf for _, mf, _ in activos], cortes
+                )
+            valido &= con_area
+        return salidas, valido
+
+
+    def activaciones(self, entradas):
+        """Indica, por salida, qué filas activan al menos uno de sus términos.
+
+        Solo fuzzifica y dispara las reglas, sin defuzzificar.
+        """
+        registros = self._fuzzificar(entradas)
+        self._aplicar_reglas(registros)
+        filas = len(next(iter(entradas.values())))
+        activas = {}
+        for etiqueta, _, terminos in self.salidas:
+            activa = np.zeros(filas, dtype=bool)
+            for registro, _, _ in terminos:
+                if registros[registro] is not None:
+                    activa |= registros[registro] > 0
+            activas[etiqueta] = activa
+        return activas
+
+    def _fuzzificar(self, entradas):
+        """Registros con la pertenencia de cada término de entrada"""
+        registros = [None] * self.num_registros
+        for etiqueta, universo, terminos in self.entradas:
+            valores = entradas[etiqueta]
+            for registro, mf in terminos:
+                registros[registro] = np.interp(valores, universo, mf)
+        return registros
+
+    def _aplicar_reglas(self, registros):
+        """Disparo y acumulación de reglas sobre los registros"""
+        for operacion, destino, a, b in self.instrucciones:
+            if operacion == 'min':
+                registros[destino] = np.fmin(registros[a], registros[b])
+            elif operacion == 'max':
+                registros[destino] = np.fmax(registros[a], registros[b])
+            elif operacion == 'acumular':
+                previa = registros[destino]
+                registros[destino] = registros[a] if previa is None else np.fmax(registros[a], previa)
+            elif operacion == 'not':
+                registros[destino] = 1. - registros[a]
+            else:
+                registros[destino] = registros[a] * b
+
+
+def _sin_medicion(etapa):
+    return nullcontext()
+
+
+def centroide_lote(universo, funciones, cortes):
+    """Centroide de la agregación de términos recortados, fila por fila.
+
+    Reproduce CrispValueCalculator de skfuzzy: el universo se amplía con los
+    puntos donde cada término cruza su nivel de corte y el área bajo la curva
+    lineal a trozos se integra de forma exacta. Devuelve los centroides y una
+    máscara que indica qué filas tienen área distinta de cero.
+    """
+    filas = len(cortes[0])
+    universo = np.asarray(universo, dtype=float)
+    paso = np.diff(universo)
+
+    # Puntos de cruce de cada término con su nivel de corte
+    puntos = [np.broadcast_to(universo, (filas, universo.size))]
+    for mf, corte in zip(funciones, cortes):
+        corte = corte[:, None]
+        encima = np.where(corte == 0., mf > corte, mf >= corte)
+        cruza = encima[:, 1:] != encima[:, :-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cruce = universo[:-1] + (corte - mf[:-1]) * paso / np.diff(mf)
+        puntos.append(np.where(cruza, cruce, universo[:-1]))
+    x = np.sort(np.concatenate(puntos, axis=1), axis=1)
+
+    # Función de salida agregada (máximo de los términos recortados)
+    y = np.zeros_like(x)
+    for mf, corte in zip(funciones, cortes):
+        np.maximum(y, np.minimum(corte[:, None], np.interp(x, universo, mf)), out=y)
+
+    # Integración exacta de cada segmento lineal
+    dx = np.diff(x, axis=1)
+    y1, y2 = y[:, :-1], y[:, 1:]
+    area = (0.5 * dx * (y1 + y2)).sum(axis=1)
+    momento = (dx * (x[:, :-1] * (2 * y1 + y2) + x[:, 1:] * (y1 + 2 * y2)) / 6).sum(axis=1)
+
+    con_area = y.sum(axis=1) != 0
+    return momento / np.fmax(area, np.finfo(float).eps), con_area
+
+
+def centroide_analitico(minimo, maximo, formas, cortes):
+    """Centroide exacto de la agregación de trapecios recortados, fila por fila.
+
+    La salida agregada max_k(min(corte_k, mu_k(x))) es lineal a trozos; sus
+    quiebres solo pueden estar en los vértices de los trapecios, donde un lado
+    inclinado cruza el nivel de corte de algún término o donde se cruzan dos
+    lados inclinados. Se evalúa la función exacta en esos puntos (un número
+    fijo, independiente del paso del universo) y se integra cada tramo.
+    """
+    filas = len(cortes[0])
+    cortes = [np.asarray(c, dtype=float) for c in cortes]
+
+    # Lados inclinados de cada trapecio como rectas y = m*x + q
+    lados = []
+    for a, b, c, d in formas:
+        if b > a:
+            lados.append((1. / (b - a), -a / (b - a)))
+        if d > c:
+            lados.append((-1. / (d - c), d / (d - c)))
+
+    # Puntos candidatos que no dependen de las entradas
+    fijos = [minimo, maximo] + [p for forma in formas for p in forma]
+    for i, (m1, q1) in enumerate(lados):
+        for m2, q2 in lados[i + 1:]:
+            if m1 != m2:
+                fijos.append((q2 - q1) / (m1 - m2))
+    puntos = [np.broadcast_to(np.array(fijos, dtype=float), (filas, len(fijos)))]
+
+    # Cruces de cada lado con cada nivel de corte
+    for m, q in lados:
+        for corte in cortes:
+            puntos.append(((corte - q) / m)[:, None])
+    x = np.sort(np.clip(np.concatenate(puntos, axis=1), minimo, maximo), axis=1)
+
+    # Evaluar la salida agregada exacta en los puntos candidatos
+    y = np.zeros_like(x)
+    for (a, b, c, d), corte in zip(formas, cortes):
+        subida = (x >= a).astype(float) if b == a else (x - a) / (b - a)
+        bajada = (x <= d).astype(float) if d == c else (d - x) / (d - c)
+        mu = np.clip(np.minimum(subida, bajada), 0., 1.)
+        np.maximum(y, np.minimum(corte[:, None], mu), out=y)
+
+    # Integración exacta de cada tramo lineal
+    dx = np.diff(x, axis=1)
+    y1, y2 = y[:, :-1], y[:, 1:]
+    area = (0.5 * dx * (y1 + y2)).sum(axis=1)
+    momento = (dx * (x[:, :-1] * (2 * y1 + y2) + x[:, 1:] * (y1 + 2 * y2)) / 6).sum(axis=1)
+
+    con_area = area > 0
+    return momento / np.fmax(area, np.finfo(float).eps), con_area
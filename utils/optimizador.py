@@ -0,0 +1,97 @@
+import numpy as np
+
+from utils.configuracion import VARIABLES_ENTRADA
+
+# Costo por unidad de cambio de cada entrada; una hora semanal cuesta menos
+# que un punto en las valoraciones de 1 a 10
+COSTOS_CAMBIO = {'horas_trabajo': 0.25, 'calidad_sueno': 1.0, 'carga_mental': 1.0, 'satisfaccion': 1.0}
+
+# Nombre y unidad de cada entrada para describir los cambios
+_DESCRIPCIONES = {
+    'horas_trabajo': ('las horas de trabajo semanales', 'hora', 'horas'),
+    'calidad_sueno': ('la calidad del sueño', 'punto', 'puntos'),
+    'carga_mental': ('la carga mental', 'punto', 'puntos'),
+    'satisfaccion': ('la satisfacción laboral', 'punto', 'puntos'),
+}
+
+
+def buscar_intervenciones(sistema, tabla, actual, objetivo=40, costos=None, max_resultados=5):
+    """Cambios de menor costo en las entradas que dejan nivel_estres por debajo de `objetivo`.
+
+    Recorre la malla de `tabla` (valores exactos del sistema en sus nodos):
+    cada entrada libre puede tomar cualquier valor de su eje y las de costo
+    None quedan fijas. Los candidatos que cumplen el objetivo se ordenan por
+    costo (sum costo[v] * |cambio en v|) y se descartan los dominados por
+    uno ya elegido, es decir, los que cambian lo mismo en la misma dirección
+    y algo más. Cada resultado se verifica con diagnosticar_lote antes de
+    aceptarlo. Si `actual` ya cumple el objetivo devuelve una única
+    intervención sin cambios.
+
+    Solo se proponen cambios que el sistema difuso diagnostica: se descartan
+    los candidatos cuya celda de la tabla toca el respaldo y los que
+    diagnosticar_lote resuelve con el cálculo manual, cuyo estrés no sale de
+    las reglas.
+    """
+    costos = {**COSTOS_CAMBIO, **(costos or {})}
+    desconocidas = set(costos) - set(VARIABLES_ENTRADA)
+    if desconocidas:
+        raise ValueError(f"Variables desconocidas en costos: {', '.join(sorted(desconocidas))}")
+    if any(c is not None and c < 0 for c in costos.values()):
+        raise ValueError("Los costos no pueden ser negativos")
+
+    actual = np.array(actual, dtype=float)
+    ejes = [
+        np.unique(np.append(eje, valor)) if costos[nombre] is not None else np.array([valor])
+        for nombre, eje, valor in zip(VARIABLES_ENTRADA, tabla.ejes, actual)
+    ]
+    malla = np.meshgrid(*ejes, indexing='ij')
+    candidatos = np.stack([m.ravel() for m in malla], axis=1)
+
+    valores = tabla.interpolar(*candidatos.T)
+    candidatos = candidatos[(valores['nivel_estres'] < objetivo) & (valores['respaldo'] <= 0)]
+    cambios = candidatos - actual
+    pesos = np.array([costos[nombre] or 0. for nombre in VARIABLES_ENTRADA])
+    costo = np.abs(cambios) @ pesos
+    orden = np.lexsort((np.abs(cambios).sum(axis=1), costo))
+    candidatos, cambios, costo = candidatos[orden], cambios[orden], costo[orden]
+
+    intervenciones = []
+    vigentes = np.ones(len(candidatos), dtype=bool)
+    while len(intervenciones) < max_resultados:
+        restantes = np.flatnonzero(vigentes)
+        if not restantes.size:
+            break
+        i = restantes[0]
+        vigentes[i] = False
+        resultado = sistema.diagnosticar_lote(*candidatos[i, :, None])
+        if resultado['respaldo'][0] or not resultado['nivel_estres'][0] < objetivo:
+            continue  # La interpolación fuera de los nodos no se confirmó
+
+        cambio = cambios[i]
+        intervenciones.append(_describir(cambio, candidatos[i], costo[i], resultado))
+        # Descartar lo que hace este mismo cambio y algo más
+        libres = cambio == 0
+        dominados = np.all(libres | ((np.sign(cambios) == np.sign(cambio)) & (np.abs(cambios) >= np.abs(cambio))),
+                           axis=1)
+        vigentes &= ~dominados
+    return intervenciones
+
+
+def _describir(cambio, entradas, costo, resultado):
+    cambios = {nombre: float(d) for nombre, d in zip(VARIABLES_ENTRADA, cambio) if d != 0}
+    pasos = []
+    for nombre, delta in cambios.items():
+        texto, singular, plural = _DESCRIPCIONES[nombre]
+        cantidad = abs(delta)
+        unidad = singular if cantidad == 1 else plural
+        pasos.append(f"{'Subir' if delta > 0 else 'Bajar'} {texto} en {cantidad:g} {unidad}")
+    return {
+        'cambios': cambios,
+        'entradas': dict(zip(VARIABLES_ENTRADA, entradas.tolist())),
+        'costo': float(costo),
+        'nivel_estres': float(resultado['nivel_estres'][0]),
+        'productividad': float(resultado['productividad'][0]),
+        'prioridad_accion': float(resultado['prioridad_accion'][0]),
+        'respaldo': bool(resultado['respaldo'][0]),
+        'descripcion': '; '.join(pasos) if pasos else 'Sin cambios: ya está por debajo del objetivo',
+    }
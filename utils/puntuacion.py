@@ -0,0 +1,252 @@
+"""Puntuación masiva de archivos CSV/Parquet desde la línea de comandos.
+
+Uso:
+    python -m utils.fuzzy_system score entrada.csv -o salida.parquet
+    python -m utils.fuzzy_system serve --puerto 8080   (ver utils.servicio)
+    python -m utils.fuzzy_system history semana.csv --semana 2026-W42   (ver utils.historial)
+
+El archivo se lee en bloques de tamaño fijo, cada bloque se diagnostica en
+un proceso del pool con diagnosticar_lote y los resultados se escriben en
+orden a medida que llegan, así que la memoria no crece con el archivo. Las
+filas con valores faltantes, no numéricos o infinitos se conservan con un
+mensaje en la columna 'error' en lugar de detener la ejecución.
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from pandas.errors import ParserWarning
+
+from utils.fuzzy_system import COLUMNAS_ENTRADA, MOTORES, SistemaBienestarLaboral
+from utils.tabla_respuesta import DIRECTORIO_CACHE
+
+COLUMNAS_SALIDA = ('nivel_estres', 'productividad', 'prioridad_accion', 'respaldo', 'error')
+
+# Sistema de cada proceso trabajador, creado una sola vez por proceso
+_sistema = None
+
+
+def _iniciar_trabajador(motor, configuracion=None, directorio_cache=DIRECTORIO_CACHE):
+    global _sistema
+    # Con el artefacto guardado los trabajadores arrancan sin importar skfuzzy
+    _sistema = SistemaBienestarLaboral(motor=motor, directorio_tabla=directorio_cache,
+                                       directorio_artefacto=directorio_cache, configuracion=configuracion)
+
+
+def puntuar_bloque(bloque, sistema=None):
+    """Diagnostica un DataFrame y devuelve una copia con las columnas de salida"""
+    sistema = sistema or _sistema
+    resultado = bloque.copy()
+    filas = len(bloque)
+
+    # Convertir las entradas; lo que no sea numérico queda como NaN
+    valores = {}
+    errores = np.full(filas, None, dtype=object)
+    validas = np.ones(filas, dtype=bool)
+    for columna in COLUMNAS_ENTRADA:
+        if columna in bloque:
+            valores[columna] = pd.to_numeric(bloque[columna], errors='coerce').to_numpy(dtype=float)
+        else:
+            valores[columna] = np.full(filas, np.nan)
+        faltantes = validas & ~np.isfinite(valores[columna])
+        errores[faltantes] = f"Valor faltante, no numérico o infinito en '{columna}'"
+        validas &= ~faltantes
+
+    for nombre in ('nivel_estres', 'productividad', 'prioridad_accion'):
+        resultado[nombre] = np.nan
+    resultado['respaldo'] = False
+    if validas.any():
+        diagnostico = sistema.diagnosticar_lote(*(valores[c][validas] for c in COLUMNAS_ENTRADA))
+        for nombre in ('nivel_estres', 'productividad', 'prioridad_accion', 'respaldo'):
+            resultado.loc[validas, nombre] = diagnostico[nombre]
+    resultado['error'] = errores
+    return resultado
+
+
+def _leer_bloques(ruta, tamano_bloque):
+    """Itera el archivo de entrada en DataFrames de a lo sumo tamano_bloque filas"""
+    if ruta.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        for lote in pq.ParquetFile(ruta).iter_batches(batch_size=tamano_bloque):
+            yield lote.to_pandas()
+    else:
+        # Todo como texto: las columnas adicionales pasan tal cual y el esquema
+        # de salida no cambia entre bloques. Con el motor C y chunksize una
+        # línea con campos de más al inicio de un bloque se trunca en lugar de
+        # omitirse; el motor python la omite igual con cualquier tamano_bloque
+        yield from pd.read_csv(ruta, chunksize=tamano_bloque, dtype=str, engine='python',
+                               on_bad_lines=_omitir_linea)
+
+
+def _omitir_linea(campos):
+    """Avisa y descarta una línea del CSV con más campos que la cabecera"""
+    warnings.warn(f"Se omite una línea con {len(campos)} campos: {','.join(campos)[:80]}", ParserWarning,
+                  stacklevel=2)
+    return None
+
+
+class _Escritor:
+    """Escribe bloques de resultados de forma incremental en CSV o Parquet"""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.parquet = ruta.endswith('.parquet')
+        self._escritor = None
+        self._esquema = None
+        self._primero = True
+
+    def escribir(self, bloque):
+        if not self.parquet:
+            bloque.to_csv(self.ruta, mode='w' if self._primero else 'a', header=self._primero, index=False)
+            self._primero = False
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        tabla = pa.Table.from_pandas(bloque, preserve_index=False)
+        if self._escritor is None:
+            # Columnas vacías en el primer bloque se fijan como texto
+            campos = [
+                pa.field(c.name, pa.string()) if pa.types.is_null(c.type) else c
+                for c in tabla.schema
+            ]
+            self._esquema = pa.schema(campos)
+            self._escritor = pq.ParquetWriter(self.ruta, self._esquema)
+        self._escritor.write_table(tabla.cast(self._esquema))
+
+    def cerrar(self):
+        if self._escritor is not None:
+            self._escritor.close()
+
+
+def puntuar_archivo(entrada, salida, motor='compilado', tamano_bloque=50_000, trabajadores=None, informar=None,
+                    configuracion=None, directorio_cache=DIRECTORIO_CACHE):
+    """Puntúa `entrada` y escribe `salida` conservando el orden de las filas.
+
+    Mantiene como máximo dos bloques por trabajador en vuelo. `configuracion`
+    es la ruta de un archivo de reglas (por defecto, CONFIGURACION_BASE).
+    Los trabajadores guardan y leen el artefacto y la tabla en
+    `directorio_cache`; con None no usan el disco.
+    Devuelve (filas, segundos).
+    """
+    trabajadores = trabajadores or os.cpu_count() or 1
+    escritor = _Escritor(salida)
+    pendientes = deque()
+    filas = 0
+    inicio = time.perf_counter()
+
+    def escribir_siguiente():
+        nonlocal filas
+        bloque = pendientes.popleft().result()
+        escritor.escribir(bloque)
+        filas += len(bloque)
+        if informar:
+            informar(filas, time.perf_counter() - inicio)
+
+    try:
+        with ProcessPoolExecutor(trabajadores, initializer=_iniciar_trabajador,
+                                 initargs=(motor, configuracion, directorio_cache)) as pool:
+            for bloque in _leer_bloques(entrada, tamano_bloque):
+                pendientes.append(pool.submit(puntuar_bloque, bloque))
+                if len(pendientes) >= 2 * trabajadores:
+                    escribir_siguiente()
+            while pendientes:
+                escribir_siguiente()
+    finally:
+        escritor.cerrar()
+
+    return filas, time.perf_counter() - inicio
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m utils.fuzzy_system', description=__doc__.splitlines()[0])
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    score = subcomandos.add_parser('score', help='Diagnostica todas las filas de un archivo CSV o Parquet')
+    score.add_argument('entrada', help='Archivo .csv o .parquet con las columnas ' + ', '.join(COLUMNAS_ENTRADA))
+    score.add_argument('-o', '--salida', required=True, help='Archivo de salida .csv o .parquet')
+    score.add_argument('--motor', choices=MOTORES, default='compilado')
+    score.add_argument('--tamano-bloque', type=int, default=50_000, help='Filas por bloque (por defecto 50000)')
+    score.add_argument('--trabajadores', type=int, default=None, help='Procesos del pool (por defecto, uno por CPU)')
+    score.add_argument('--configuracion', default=None, help='Archivo JSON/YAML de variables y reglas')
+
+    serve = subcomandos.add_parser('serve', help='Atiende diagnósticos por HTTP/JSON agrupando peticiones')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--puerto', type=int, default=8080)
+    serve.add_argument('--motor', choices=('compilado', 'tabla'), default='compilado')
+    serve.add_argument('--ventana-ms', type=float, default=2.0,
+                       help='Espera máxima para agrupar peticiones (por defecto 2 ms)')
+    serve.add_argument('--max-lote', type=int, default=4096, help='Filas máximas por lote')
+    serve.add_argument('--max-pendientes', type=int, default=20_000,
+                       help='Filas en cola a partir de las cuales se responde 503')
+    serve.add_argument('--configuracion', default=None,
+                       help='Archivo JSON/YAML de variables y reglas; se recarga si cambia')
+
+    history = subcomandos.add_parser('history', help='Agrega una semana al historial por empleado')
+    history.add_argument('entrada', help='Archivo .csv o .parquet con id_empleado y las columnas de entrada')
+    history.add_argument('--semana', default=None, help="Semana ISO 'AAAA-Wss' (por defecto, la actual)")
+    history.add_argument('--directorio', default=None, help='Directorio del historial')
+    history.add_argument('--motor', choices=MOTORES, default='compilado')
+    history.add_argument('--configuracion', default=None, help='Archivo JSON/YAML de variables y reglas')
+
+    args = parser.parse_args(argv)
+    if args.comando == 'serve':
+        return _servir(args)
+    if args.comando == 'history':
+        return _registrar_historial(args)
+
+    def informar(filas, segundos):
+        print(f"\r{filas:,} filas · {filas / max(segundos, 1e-9):,.0f} filas/s", end='', file=sys.stderr, flush=True)
+
+    filas, segundos = puntuar_archivo(
+        args.entrada, args.salida, args.motor, args.tamano_bloque, args.trabajadores, informar, args.configuracion
+    )
+    print(f"\n{filas:,} filas en {segundos:.2f} s ({filas / max(segundos, 1e-9):,.0f} filas/s) -> {args.salida}",
+          file=sys.stderr)
+    return 0
+
+
+def _servir(args):
+    import asyncio
+
+    from utils.configuracion import CONFIGURACION_BASE
+    from utils.recarga import SistemaRecargable
+    from utils.servicio import servir
+
+    sistema = SistemaRecargable(
+        args.configuracion or CONFIGURACION_BASE, motor=args.motor, directorio_artefacto=DIRECTORIO_CACHE
+    )
+    sistema.vigilar()
+
+    def informar(direccion):
+        print(f"Escuchando en http://{direccion[0]}:{direccion[1]}", file=sys.stderr, flush=True)
+
+    try:
+        asyncio.run(servir(sistema, args.host, args.puerto, args.ventana_ms / 1000, args.max_lote,
+                           args.max_pendientes, informar))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sistema.detener()
+    return 0
+
+
+def _registrar_historial(args):
+    from utils.historial import DIRECTORIO_HISTORIAL, HistorialBienestar, semana_iso
+
+    historial = HistorialBienestar(args.directorio or DIRECTORIO_HISTORIAL)
+    sistema = SistemaBienestarLaboral(motor=args.motor, directorio_artefacto=DIRECTORIO_CACHE,
+                                      configuracion=args.configuracion)
+    semana = args.semana or semana_iso()
+    datos = pd.concat(_leer_bloques(args.entrada, 50_000), ignore_index=True)
+    inicio = time.perf_counter()
+    validas = historial.registrar_semana(semana, datos, sistema)
+    print(f"{semana}: {validas:,} de {len(datos):,} filas diagnosticadas en {time.perf_counter() - inicio:.2f} s "
+          f"-> {historial.directorio}", file=sys.stderr)
+    return 0
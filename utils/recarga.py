@@ -0,0 +1,126 @@
+import os
+import threading
+from collections import OrderedDict
+
+from utils.configuracion import CONFIGURACION_BASE, cargar_configuracion
+from utils.fuzzy_system import SistemaBienestarLaboral
+
+
+class SistemaRecargable:
+    """SistemaBienestarLaboral que se reemplaza en caliente al cambiar su configuración.
+
+    Cada configuración se compila una sola vez y se guarda por la firma de su
+    contenido (las últimas `versiones_guardadas`), así que volver a una
+    versión anterior no la reconstruye. El cambio de versión es una sola
+    asignación: las llamadas en curso terminan con la versión con la que
+    empezaron y las siguientes usan la nueva. Una configuración inválida no
+    reemplaza a la actual.
+
+    Las opciones adicionales se pasan a SistemaBienestarLaboral; el resto de
+    atributos y métodos (diagnosticar_lote, estadisticas_caminos, ...) se
+    delegan en la versión actual.
+    """
+
+    def __init__(self, ruta=CONFIGURACION_BASE, versiones_guardadas=4, **opciones):
+        if versiones_guardadas < 1:
+            raise ValueError("versiones_guardadas debe ser al menos 1")
+        self.ruta = ruta
+        self.opciones = opciones
+        self.versiones_guardadas = versiones_guardadas
+        self.recargas = 0
+        self.ultimo_error = None
+        self._versiones = OrderedDict()
+        self._candado = threading.Lock()
+        self._detener = threading.Event()
+        self._vigilante = None
+        self._estado_archivo = self._leer_estado()
+        self._sistema = self._compilar(*cargar_configuracion(ruta))
+
+    def __getattr__(self, nombre):
+        # Solo se llama con atributos que el envoltorio no tiene
+        if nombre == '_sistema':
+            raise AttributeError(nombre)
+        return getattr(self._sistema, nombre)
+
+    @property
+    def sistema(self):
+        """Versión del sistema en uso"""
+        return self._sistema
+
+    @property
+    def firma(self):
+        """Firma de la configuración en uso"""
+        return self._sistema.firma_configuracion
+
+    def diagnosticar(self, horas, sueno, carga, satisf):
+        return self._sistema.diagnosticar(horas, sueno, carga, satisf)
+
+    def recargar(self):
+        """Lee de nuevo el archivo y cambia de versión si su contenido cambió.
+
+        Devuelve True si hubo cambio de versión. Si el archivo no es válido
+        lanza la excepción correspondiente y la versión actual sigue en uso.
+        """
+        with self._candado:
+            self._estado_archivo = self._leer_estado()
+            configuracion, firma = cargar_configuracion(self.ruta)
+            if firma == self.firma:
+                return False
+            self._sistema = self._compilar(configuracion, firma)
+            self.recargas += 1
+            return True
+
+    def comprobar(self):
+        """Recarga si el archivo cambió desde la última lectura.
+
+        Si no cambió solo cuesta un stat, así que puede llamarse en cada
+        petición. Los errores de una configuración inválida no se propagan:
+        quedan en ultimo_error hasta la siguiente recarga correcta.
+        """
+        if self._leer_estado() == self._estado_archivo:
+            return False
+        try:
+            cambio = self.recargar()
+        except Exception as error:
+            self.ultimo_error = error
+            return False
+        self.ultimo_error = None
+        return cambio
+
+    def vigilar(self, intervalo=2.0):
+        """Comprueba el archivo cada `intervalo` segundos en un hilo de fondo"""
+        if self._vigilante is not None and self._vigilante.is_alive():
+            return
+        self._detener.clear()
+
+        def bucle():
+            while not self._detener.wait(intervalo):
+                self.comprobar()
+
+        self._vigilante = threading.Thread(target=bucle, name='vigilante-configuracion', daemon=True)
+        self._vigilante.start()
+
+    def detener(self):
+        """Detiene el hilo de vigilar"""
+        self._detener.set()
+        if self._vigilante is not None:
+            self._vigilante.join()
+            self._vigilante = None
+
+    def _compilar(self, configuracion, firma):
+        """Devuelve el sistema de esta firma, construyéndolo solo si no está guardado"""
+        sistema = self._versiones.get(firma)
+        if sistema is None:
+            sistema = SistemaBienestarLaboral(configuracion=configuracion, **self.opciones)
+            self._versiones[firma] = sistema
+            while len(self._versiones) > self.versiones_guardadas:
+                self._versiones.popitem(last=False)
+        self._versiones.move_to_end(firma)
+        return sistema
+
+    def _leer_estado(self):
+        try:
+            estado = os.stat(self.ruta)
+        except OSError:
+            return None
+        return (estado.st_mtime_ns, estado.st_size)
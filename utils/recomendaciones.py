@@ -0,0 +1,66 @@
+"""Catálogo compartido de recomendaciones y su codificación compacta.
+
+Las recomendaciones de un diagnóstico dependen solo de tres bandas: la de
+nivel_estres (hasta 40, hasta 70, más de 70), la de productividad (menos
+de 50, hasta 80, más de 80) y la de prioridad_accion (hasta 7, más de 7).
+Cada combinación de bandas es un código de 0 a 17 que cabe en un uint8, y
+cada código corresponde a una tupla fija de posiciones de CATALOGO. Las
+filas sin diagnóstico (alguna salida NaN o infinita) tienen su propio
+código, CODIGO_SIN_DIAGNOSTICO, que nunca se confunde con un estrés sano. Las
+entradas del catálogo existen una sola vez en memoria; los diccionarios de
+cada diagnóstico se crean solo al materializarlo.
+"""
+import numpy as np
+
+CATALOGO = (
+    {"tipo": "🚨 CRÍTICO", "mensaje": "Nivel de estrés crítico detectado", "accion": "Consulta inmediata con profesional"},
+    {"tipo": "🩺 SALUD", "mensaje": "Considerar días de descanso urgentes", "accion": "Coordinar con RRHH"},
+    {"tipo": "⚖️ CARGA", "mensaje": "Revisión urgente de carga laboral", "accion": "Hablar con supervisor"},
+    {"tipo": "⚠️ ALERTA", "mensaje": "Estrés moderado - atención requerida", "accion": "Implementar técnicas de relajación"},
+    {"tipo": "😴 SUEÑO", "mensaje": "Mejorar higiene de sueño", "accion": "Establecer rutina nocturna"},
+    {"tipo": "⏰ LÍMITES", "mensaje": "Establecer límites laborales claros", "accion": "Definir horarios de desconexión"},
+    {"tipo": "✅ ÓPTIMO", "mensaje": "Nivel de estrés saludable", "accion": "Mantener buenos hábitos actuales"},
+    {"tipo": "📉 PRODUCTIVIDAD", "mensaje": "Productividad por debajo del óptimo", "accion": "Revisar distribución de tareas"},
+    {"tipo": "🎯 ENFOQUE", "mensaje": "Implementar técnicas de concentración", "accion": "Usar método Pomodoro"},
+    {"tipo": "🚫 DISTRACCIONES", "mensaje": "Identificar y eliminar distracciones", "accion": "Bloquear notificaciones innecesarias"},
+    {"tipo": "🔥 SOBRECARGA", "mensaje": "Productividad muy alta - riesgo de burnout", "accion": "Evaluar sostenibilidad del ritmo"},
+    {"tipo": "🎯 PRIORIDAD", "mensaje": "ACCIÓN INMEDIATA REQUERIDA", "accion": "Implementar recomendaciones urgentemente"},
+    {"tipo": "❔ SIN DIAGNÓSTICO", "mensaje": "No se pudo diagnosticar con estos datos", "accion": "Revisar los valores de entrada"},
+)
+
+# Posiciones del catálogo por banda, en el orden en que se muestran
+_POR_ESTRES = ((6,), (3, 4, 5), (0, 1, 2))           # saludable, moderado, crítico
+_POR_PRODUCTIVIDAD = ((), (7, 8, 9), (10,))         # normal, baja, muy alta
+_POR_PRIORIDAD = ((), (11,))                        # normal, inmediata
+
+# Recomendaciones de cada código: código = estrés * 6 + productividad * 2 + prioridad
+COMBINACIONES = tuple(
+    estres + productividad + prioridad
+    for estres in _POR_ESTRES
+    for productividad in _POR_PRODUCTIVIDAD
+    for prioridad in _POR_PRIORIDAD
+) + ((12,),)
+
+# Código de las filas con alguna salida no finita
+CODIGO_SIN_DIAGNOSTICO = len(COMBINACIONES) - 1
+
+
+def codigo_recomendaciones(estres, productividad, prioridad):
+    """Código de las recomendaciones; acepta escalares o arreglos (devuelve uint8).
+
+    Si alguna de las tres salidas no es finita el código es
+    CODIGO_SIN_DIAGNOSTICO.
+    """
+    codigo = (
+        ((estres > 40) * 1 + (estres > 70) * 1) * 6
+        + ((productividad < 50) * 1 + (productividad > 80) * 2) * 2
+        + (prioridad > 7) * 1
+    )
+    finitas = np.isfinite(estres) & np.isfinite(productividad) & np.isfinite(prioridad)
+    codigo = np.where(finitas, codigo, CODIGO_SIN_DIAGNOSTICO)
+    return codigo.astype(np.uint8) if codigo.ndim else int(codigo)
+
+
+def materializar(codigo):
+    """Lista nueva de diccionarios de recomendación para un código"""
+    return [dict(CATALOGO[i]) for i in COMBINACIONES[codigo]]
@@ -0,0 +1,87 @@
+import os
+from collections.abc import Sequence
+
+import numpy as np
+
+from utils.fuzzy_system import MENSAJE_SIN_ACTIVACION
+from utils.recomendaciones import materializar
+
+# Columnas de un ResultadoLote y su tipo: 14 bytes por fila
+COLUMNAS_COMPACTAS = {
+    'nivel_estres': np.float32,
+    'productividad': np.float32,
+    'prioridad_accion': np.float32,
+    'respaldo': np.bool_,
+    'codigo': np.uint8,
+}
+
+
+class ResultadoLote(Sequence):
+    """Resultado de muchos diagnósticos en arreglos compactos.
+
+    Guarda las tres salidas en float32, la marca de respaldo y un código
+    uint8 de recomendaciones (ver utils.recomendaciones) por fila. Con
+    `directorio` cada columna es un .npy abierto con memmap, así que el
+    resultado puede ser mayor que la memoria disponible.
+
+    resultado[i] devuelve el diccionario de diagnosticar para la fila i,
+    creado en ese momento; resultado[a:b] es una vista sin copiar.
+    """
+
+    def __init__(self, columnas, directorio=None):
+        self.columnas = columnas
+        self.directorio = directorio
+
+    @classmethod
+    def crear(cls, filas, directorio=None):
+        """Resultado sin llenar de `filas` filas, en memoria o en `directorio`"""
+        if directorio is None:
+            return cls({nombre: np.empty(filas, dtype=tipo) for nombre, tipo in COLUMNAS_COMPACTAS.items()})
+        os.makedirs(directorio, exist_ok=True)
+        columnas = {
+            nombre: np.lib.format.open_memmap(os.path.join(directorio, f"{nombre}.npy"), mode='w+', dtype=tipo,
+                                              shape=(filas,))
+            for nombre, tipo in COLUMNAS_COMPACTAS.items()
+        }
+        return cls(columnas, directorio)
+
+    @classmethod
+    def abrir(cls, directorio, modo='r'):
+        """Abre un resultado guardado con crear(directorio=...) sin leerlo entero"""
+        return cls({
+            nombre: np.load(os.path.join(directorio, f"{nombre}.npy"), mmap_mode=modo)
+            for nombre in COLUMNAS_COMPACTAS
+        }, directorio)
+
+    def __len__(self):
+        return len(self.columnas['codigo'])
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return ResultadoLote({nombre: valores[indice] for nombre, valores in self.columnas.items()}, self.directorio)
+        fila = {
+            'nivel_estres': float(self.columnas['nivel_estres'][indice]),
+            'productividad': float(self.columnas['productividad'][indice]),
+            'prioridad_accion': float(self.columnas['prioridad_accion'][indice]),
+            'recomendaciones': materializar(self.columnas['codigo'][indice]),
+        }
+        if self.columnas['respaldo'][indice]:
+            fila['advertencia'] = f"Sistema difuso temporalmente no disponible. {MENSAJE_SIN_ACTIVACION}"
+        return fila
+
+    def __getattr__(self, nombre):
+        # resultado.nivel_estres, resultado.codigo, ... devuelven la columna
+        columnas = self.__dict__.get('columnas', {})
+        if nombre in columnas:
+            return columnas[nombre]
+        raise AttributeError(nombre)
+
+    @property
+    def nbytes(self):
+        return sum(valores.nbytes for valores in self.columnas.values())
+
+    def flush(self):
+        """Escribe en disco las columnas respaldadas por memmap"""
+        for valores in self.columnas.values():
+            if isinstance(valores, np.memmap):
+                valores.flush()
@@ -0,0 +1,316 @@
+"""Servicio HTTP/JSON de diagnóstico con agrupación de peticiones.
+
+Uso:
+    python -m utils.fuzzy_system serve --puerto 8080
+
+Endpoints:
+    POST /diagnosticar   {"horas_trabajo": 40, "calidad_sueno": 6, ...}
+                         o {"personas": [{...}, ...]} (también una lista)
+    GET  /salud          estado del servicio y de la cola
+    GET  /estadisticas   rendimiento, latencias y tamaño de los lotes
+
+Las peticiones que llegan dentro de una ventana corta se agrupan en una sola
+llamada a diagnosticar_lote. Las filas pendientes están acotadas: con la
+cola llena el servicio responde 503 con Retry-After en lugar de acumular
+latencia. Solo usa la biblioteca estándar y NumPy.
+"""
+import asyncio
+import json
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+
+from utils.fuzzy_system import COLUMNAS_ENTRADA
+from utils.instrumentacion import Instrumentacion
+
+# Tamaño máximo del cuerpo de una petición
+MAX_CUERPO = 8 * 2**20
+
+SALIDAS = ('nivel_estres', 'productividad', 'prioridad_accion', 'respaldo')
+
+
+class ColaLlena(Exception):
+    """No caben más filas pendientes; el cliente debe reintentar"""
+
+
+class PeticionInvalida(ValueError):
+    """El cuerpo de la petición no tiene el formato esperado"""
+
+
+class AgrupadorLotes:
+    """Agrupa diagnósticos concurrentes en llamadas a diagnosticar_lote.
+
+    Un único bucle toma la primera petición pendiente, espera a lo sumo
+    `ventana` segundos (o hasta juntar `max_filas`) a que lleguen más, y
+    evalúa todas juntas en un hilo aparte para no bloquear el bucle de
+    eventos. Mientras un lote se evalúa, el siguiente se va llenando.
+    """
+
+    def __init__(self, sistema, ventana=0.002, max_filas=4096, max_pendientes=20_000, instrumentacion=None):
+        self.sistema = sistema
+        self.ventana = ventana
+        self.max_filas = max_filas
+        self.max_pendientes = max_pendientes
+        self.instrumentacion = instrumentacion or Instrumentacion()
+        self.pendientes = 0
+        self._cola = asyncio.Queue()
+        self._ejecutor = ThreadPoolExecutor(1, thread_name_prefix='diagnostico')
+        self._tarea = None
+
+    def iniciar(self):
+        self._tarea = asyncio.get_running_loop().create_task(self._bucle())
+
+    async def detener(self):
+        if self._tarea is not None:
+            self._tarea.cancel()
+            try:
+                await self._tarea
+            except asyncio.CancelledError:
+                pass
+        self._ejecutor.shutdown(wait=False)
+
+    async def diagnosticar(self, filas):
+        """Diagnostica un arreglo (n, 4) de entradas; devuelve un diccionario de arreglos"""
+        if len(filas) > self.max_pendientes:
+            raise PeticionInvalida(f"Un lote no puede superar {self.max_pendientes} personas; divídalo")
+        if self.pendientes + len(filas) > self.max_pendientes:
+            self.instrumentacion.contar('rechazadas')
+            raise ColaLlena()
+        self.pendientes += len(filas)
+        futuro = asyncio.get_running_loop().create_future()
+        self._cola.put_nowait((filas, futuro))
+        return await futuro
+
+    async def _bucle(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = [await self._cola.get()]
+            filas = len(lote[0][0])
+            limite = loop.time() + self.ventana
+            while filas < self.max_filas:
+                try:
+                    siguiente = self._cola.get_nowait()
+                except asyncio.QueueEmpty:
+                    restante = limite - loop.time()
+                    if restante <= 0:
+                        break
+                    try:
+                        siguiente = await asyncio.wait_for(self._cola.get(), restante)
+                    except asyncio.TimeoutError:
+                        break
+                lote.append(siguiente)
+                filas += len(siguiente[0])
+            await self._evaluar(loop, lote, filas)
+
+    async def _evaluar(self, loop, lote, filas):
+        entradas = np.concatenate([filas_peticion for filas_peticion, _ in lote])
+        inicio = time.perf_counter()
+        try:
+            resultado = await loop.run_in_executor(self._ejecutor, self.sistema.diagnosticar_lote, *entradas.T)
+        except Exception as error:
+            for _, futuro in lote:
+                if not futuro.done():
+                    futuro.set_exception(error)
+            return
+        finally:
+            self.pendientes -= filas
+        self.instrumentacion.registrar('lote', time.perf_counter() - inicio)
+        self.instrumentacion.contar('lotes')
+        self.instrumentacion.contar('filas', filas)
+
+        desde = 0
+        for filas_peticion, futuro in lote:
+            hasta = desde + len(filas_peticion)
+            if not futuro.done():
+                futuro.set_result({nombre: resultado[nombre][desde:hasta] for nombre in SALIDAS})
+            desde = hasta
+
+
+class ServicioDiagnostico:
+    """Servidor HTTP/1.1 mínimo sobre asyncio que expone el AgrupadorLotes"""
+
+    def __init__(self, sistema, ventana=0.002, max_filas=4096, max_pendientes=20_000):
+        self.sistema = sistema
+        self.instrumentacion = Instrumentacion()
+        self.agrupador = AgrupadorLotes(sistema, ventana, max_filas, max_pendientes, self.instrumentacion)
+        self._inicio = time.monotonic()
+        self._servidor = None
+
+    async def iniciar(self, host='127.0.0.1', puerto=8080):
+        self.agrupador.iniciar()
+        self._inicio = time.monotonic()
+        self._servidor = await asyncio.start_server(self._atender, host, puerto)
+        return self._servidor.sockets[0].getsockname()[:2]
+
+    async def detener(self):
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        await self.agrupador.detener()
+
+    async def _atender(self, lector, escritor):
+        """Atiende las peticiones de una conexión (con keep-alive)"""
+        try:
+            while True:
+                try:
+                    # readline lanza ValueError si la línea supera el límite del lector
+                    linea = await lector.readline()
+                    if not linea:
+                        break
+                    metodo, ruta, version = linea.decode('latin-1').split()
+                    cabeceras = {}
+                    while True:
+                        cabecera = await lector.readline()
+                        if cabecera in (b'\r\n', b'\n', b''):
+                            break
+                        nombre, valor = cabecera.decode('latin-1').split(':', 1)
+                        cabeceras[nombre.strip().lower()] = valor.strip()
+                    largo = int(cabeceras.get('content-length', 0))
+                    if largo < 0:
+                        raise ValueError(f"Content-Length negativo: {largo}")
+                except ValueError:
+                    await self._escribir(escritor, HTTPStatus.BAD_REQUEST, {'error': 'Petición HTTP mal formada'})
+                    break
+                if largo > MAX_CUERPO:
+                    await self._escribir(escritor, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                         {'error': f'El cuerpo supera {MAX_CUERPO} bytes'})
+                    break
+                cuerpo = await lector.readexactly(largo) if largo else b''
+
+                estado, datos, extra = await self._responder(metodo, ruta.split('?', 1)[0], cuerpo)
+                mantener = version == 'HTTP/1.1' and cabeceras.get('connection', '').lower() != 'close'
+                await self._escribir(escritor, estado, datos, extra, mantener)
+                if not mantener:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _responder(self, metodo, ruta, cuerpo):
+        """Devuelve (estado, datos JSON, cabeceras adicionales)"""
+        if ruta == '/salud':
+            if metodo != 'GET':
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'Use GET'}, {'Allow': 'GET'}
+            return HTTPStatus.OK, self.salud(), {}
+        if ruta == '/estadisticas':
+            if metodo != 'GET':
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'Use GET'}, {'Allow': 'GET'}
+            return HTTPStatus.OK, self.estadisticas(), {}
+        if ruta != '/diagnosticar':
+            return HTTPStatus.NOT_FOUND, {'error': f'Ruta desconocida: {ruta}'}, {}
+        if metodo != 'POST':
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'Use POST'}, {'Allow': 'POST'}
+
+        inicio = time.perf_counter()
+        try:
+            filas, individual, con_recomendaciones = leer_personas(cuerpo)
+            resultado = await self.agrupador.diagnosticar(filas)
+        except PeticionInvalida as error:
+            self.instrumentacion.contar('invalidas')
+            return HTTPStatus.BAD_REQUEST, {'error': str(error)}, {}
+        except ColaLlena:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {'error': 'Servicio saturado, reintente'}, {'Retry-After': '1'}
+        except Exception as error:
+            self.instrumentacion.contar('errores')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(error)}, {}
+
+        personas = self._formatear(resultado, con_recomendaciones)
+        self.instrumentacion.registrar('peticion', time.perf_counter() - inicio)
+        self.instrumentacion.contar('peticiones')
+        return HTTPStatus.OK, personas[0] if individual else {'resultados': personas}, {}
+
+    def _formatear(self, resultado, con_recomendaciones):
+        columnas = {nombre: resultado[nombre].tolist() for nombre in SALIDAS}
+        personas = [dict(zip(SALIDAS, valores)) for valores in zip(*columnas.values())]
+        if con_recomendaciones:
+            recomendaciones = self.sistema.recomendaciones_lote(
+                resultado['nivel_estres'], resultado['productividad'], resultado['prioridad_accion']
+            )
+            for persona, lista in zip(personas, recomendaciones):
+                persona['recomendaciones'] = lista
+        return personas
+
+    def salud(self):
+        return {
+            'estado': 'saturado' if self.agrupador.pendientes >= self.agrupador.max_pendientes else 'ok',
+            'pendientes': self.agrupador.pendientes,
+            'max_pendientes': self.agrupador.max_pendientes,
+            'segundos_activo': round(time.monotonic() - self._inicio, 3),
+        }
+
+    def estadisticas(self):
+        """Rendimiento desde el arranque, latencias (ms) y tamaño medio de lote"""
+        resumen = self.instrumentacion.resumen()
+        contadores = resumen['contadores']
+        segundos = max(time.monotonic() - self._inicio, 1e-9)
+        return {
+            'peticiones': contadores.get('peticiones', 0),
+            'filas': contadores.get('filas', 0),
+            'lotes': contadores.get('lotes', 0),
+            'rechazadas': contadores.get('rechazadas', 0),
+            'invalidas': contadores.get('invalidas', 0),
+            'errores': contadores.get('errores', 0),
+            'peticiones_por_segundo': contadores.get('peticiones', 0) / segundos,
+            'filas_por_segundo': contadores.get('filas', 0) / segundos,
+            'filas_por_lote': contadores.get('filas', 0) / max(contadores.get('lotes', 0), 1),
+            'latencias': resumen['etapas'],
+            'caminos': self.sistema.estadisticas_caminos(),
+        }
+
+    @staticmethod
+    async def _escribir(escritor, estado, datos, extra=None, mantener=False):
+        cuerpo = json.dumps(datos, ensure_ascii=False).encode()
+        cabeceras = [
+            f"HTTP/1.1 {estado.value} {estado.phrase}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(cuerpo)}",
+            f"Connection: {'keep-alive' if mantener else 'close'}",
+        ]
+        cabeceras += [f"{nombre}: {valor}" for nombre, valor in (extra or {}).items()]
+        escritor.write(('\r\n'.join(cabeceras) + '\r\n\r\n').encode('latin-1') + cuerpo)
+        await escritor.drain()
+
+
+def leer_personas(cuerpo):
+    """Convierte el cuerpo JSON en (filas (n, 4), es_individual, con_recomendaciones)"""
+    try:
+        datos = json.loads(cuerpo or b'null')
+    except ValueError as error:
+        raise PeticionInvalida(f"JSON inválido: {error}") from None
+
+    con_recomendaciones = True
+    if isinstance(datos, dict) and 'personas' in datos:
+        con_recomendaciones = bool(datos.get('recomendaciones', True))
+        datos = datos['personas']
+    individual = isinstance(datos, dict)
+    personas = [datos] if individual else datos
+    if not isinstance(personas, list) or not personas:
+        raise PeticionInvalida("Envíe una persona o una lista no vacía en 'personas'")
+
+    filas = np.empty((len(personas), len(COLUMNAS_ENTRADA)))
+    for i, persona in enumerate(personas):
+        if not isinstance(persona, dict):
+            raise PeticionInvalida(f"La persona {i} no es un objeto")
+        for j, columna in enumerate(COLUMNAS_ENTRADA):
+            valor = persona.get(columna)
+            if isinstance(valor, bool) or not isinstance(valor, (int, float)) or not math.isfinite(valor):
+                raise PeticionInvalida(f"Valor faltante o no numérico en '{columna}' (persona {i})")
+            filas[i, j] = valor
+    return filas, individual, con_recomendaciones
+
+
+async def servir(sistema, host='127.0.0.1', puerto=8080, ventana=0.002, max_filas=4096, max_pendientes=20_000,
+                 informar=None):
+    """Atiende peticiones hasta que se cancele la tarea"""
+    servicio = ServicioDiagnostico(sistema, ventana, max_filas, max_pendientes)
+    direccion = await servicio.iniciar(host, puerto)
+    if informar:
+        informar(direccion)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await servicio.detener()
@@ -0,0 +1,151 @@
+import hashlib
+import itertools
+import os
+
+import numpy as np
+
+# Directorio por defecto donde se guardan las tablas precalculadas
+DIRECTORIO_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'bienestar_laboral')
+
+# Se incrementa si cambia el formato o el cálculo de la tabla
+VERSION_TABLA = 2
+
+# Módulos cuyo código llena la tabla (evaluación, cobertura y respaldo);
+# cualquier cambio en ellos invalida las tablas guardadas
+MODULOS_TABLA = ('fuzzy_system.py', 'motor_compilado.py', 'cobertura.py', 'tabla_respuesta.py')
+
+# Canales almacenados por cada punto de la malla
+CANALES = ('nivel_estres', 'productividad', 'prioridad_accion', 'respaldo')
+
+
+class TablaRespuesta:
+    """Superficie de respuesta precalculada del sistema difuso.
+
+    Evalúa el sistema una sola vez sobre una malla regular de las cuatro
+    entradas y responde por interpolación multilineal. En los puntos de la
+    malla el resultado coincide con el sistema difuso (precisión float32);
+    entre puntos es una aproximación lineal.
+    """
+
+    def __init__(self, ejes, valores, firma):
+        self.ejes = ejes
+        self.valores = valores
+        self.firma = firma
+        self._inicio = np.array([eje[0] for eje in ejes])
+        self._paso = np.array([eje[1] - eje[0] for eje in ejes])
+        self._limite = np.array([len(eje) - 2 for eje in ejes])
+
+    @classmethod
+    def cargar_o_construir(cls, sistema, paso=1.0, directorio=DIRECTORIO_CACHE):
+        """Carga la tabla del disco si existe para esta configuración, o la construye y guarda"""
+        ejes = cls._crear_ejes(sistema, paso)
+        firma = firma_sistema(sistema, ejes)
+        ruta = os.path.join(directorio, f"tabla_{firma[:16]}.npy") if directorio else None
+
+        if ruta and os.path.exists(ruta):
+            try:
+                valores = np.load(ruta, mmap_mode='r')
+                if valores.shape == tuple(len(eje) for eje in ejes) + (len(CANALES),):
+                    return cls(ejes, valores, firma)
+            except (OSError, ValueError):
+                pass  # Archivo dañado: se reconstruye
+
+        tabla = cls(ejes, cls._evaluar_malla(sistema, ejes), firma)
+        if ruta:
+            tabla.guardar(ruta)
+        return tabla
+
+    @staticmethod
+    def _crear_ejes(sistema, paso):
+        """Crea los ejes de la malla cubriendo el universo de cada antecedente"""
+        ejes = []
+        for _, universo, _ in sistema.plan.entradas:
+            minimo, maximo = float(universo.min()), float(universo.max())
+            puntos = int(np.ceil(round((maximo - minimo) / paso, 9))) + 1
+            ejes.append(np.linspace(minimo, maximo, puntos))
+        return ejes
+
+    @staticmethod
+    def _evaluar_malla(sistema, ejes):
+        """Evalúa el sistema difuso en todos los puntos de la malla"""
+        malla = np.meshgrid(*ejes, indexing='ij')
+        resultado = sistema.diagnosticar_lote(*malla)
+        return np.stack([resultado[canal] for canal in CANALES], axis=-1).astype(np.float32)
+
+    def guardar(self, ruta):
+        """Guarda la tabla de forma atómica para que otros procesos no lean archivos a medias"""
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, 'wb') as archivo:
+            np.save(archivo, np.ascontiguousarray(self.valores))
+        os.replace(temporal, ruta)
+
+    def interpolar(self, horas, sueno, carga, satisf):
+        """Interpolación multilineal; acepta escalares o arreglos.
+
+        Devuelve un diccionario con un valor (o arreglo) por canal. El canal
+        'respaldo' es mayor que cero cuando algún vértice usado provino del
+        cálculo manual.
+        """
+        coordenadas = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (horas, sueno, carga, satisf)))
+        indices, fracciones = [], []
+        for d, valor in enumerate(coordenadas):
+            posicion = np.clip((valor - self._inicio[d]) / self._paso[d], 0, self._limite[d] + 1)
+            indice = np.minimum(np.floor(posicion).astype(np.intp), self._limite[d])
+            indices.append(indice)
+            fracciones.append(posicion - indice)
+
+        # Suma ponderada de los 16 vértices del hipercubo que contiene cada punto
+        salida = 0.
+        for vertice in itertools.product((0, 1), repeat=4):
+            peso = 1.
+            for d, bit in enumerate(vertice):
+                peso = peso * (fracciones[d] if bit else 1. - fracciones[d])
+            esquina = tuple(indice + bit for indice, bit in zip(indices, vertice))
+            salida = salida + peso[..., None] * self.valores[esquina]
+
+        return {canal: salida[..., i] for i, canal in enumerate(CANALES)}
+
+    def interpolar_punto(self, horas, sueno, carga, satisf):
+        """Versión escalar de interpolar, sin el costo de preparar arreglos"""
+        cortes, fracciones = [], []
+        for d, valor in enumerate((horas, sueno, carga, satisf)):
+            limite = int(self._limite[d])
+            posicion = min(max((valor - self._inicio[d]) / self._paso[d], 0.), limite + 1.)
+            indice = min(int(posicion), limite)
+            cortes.append(slice(indice, indice + 2))
+            fracciones.append(posicion - indice)
+
+        # Reducir el hipercubo 2x2x2x2 una dimensión a la vez
+        bloque = self.valores[tuple(cortes)].astype(float)
+        for fraccion in fracciones:
+            bloque = bloque[0] * (1. - fraccion) + bloque[1] * fraccion
+
+        return dict(zip(CANALES, bloque.tolist()))
+
+
+def firma_sistema(sistema, ejes=()):
+    """Hash de las funciones de pertenencia, las reglas, el centroide, la malla de evaluación y el código que la llena.
+
+    Se calcula sobre el plan compilado para que valga también con un sistema
+    cargado de un ArtefactoSistema.
+    """
+    plan = sistema.plan
+    h = hashlib.sha256(f"v{VERSION_TABLA}".encode())
+    carpeta = os.path.dirname(os.path.abspath(__file__))
+    for nombre in MODULOS_TABLA:
+        with open(os.path.join(carpeta, nombre), 'rb') as archivo:
+            h.update(archivo.read())
+    for etiqueta, universo, terminos in plan.entradas + plan.salidas:
+        h.update(etiqueta.encode())
+        h.update(np.asarray(universo, dtype=float).tobytes())
+        for termino in terminos:
+            h.update(repr(termino[0]).encode())
+            h.update(np.asarray(termino[1], dtype=float).tobytes())
+            if len(termino) > 2:
+                h.update(repr(termino[2]).encode())
+    h.update(repr(plan.instrucciones).encode())
+    h.update(plan.centroide.encode())
+    for eje in ejes:
+        h.update(np.asarray(eje, dtype=float).tobytes())
+    return h.hexdigest()